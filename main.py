@@ -1,16 +1,19 @@
 import os
-import sys
+import atexit
+import time
+import asyncio
 import requests
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.logger import Logger
+from dotenv import load_dotenv
 from typing import List, Optional
 from mcp.server.fastmcp import FastMCP
-from src.llm.openai_client import OpenAIClient
+from src.registry import registry
 from src.db.mongo.database import MongoDBManager
-from src.db.mongo.analyzer import MongoDBAnalyzer
 from src.db.mysql.database import MySQLDBManager
-from src.db.mysql.analyzer import MySQLDBAnalyzer
 from src.db.postgres.database import PostgresDBManager
-from src.db.postgres.analyzer import PostgresDBAnalyzer
 from src.validator import EmailPayload, PushPayload, SMSPayload
 # print("Python executable:", sys.executable, file=sys.stderr)
 # print("Python path:", sys.path, file=sys.stderr)
@@ -18,17 +21,78 @@ from src.validator import EmailPayload, PushPayload, SMSPayload
 # Create an MCP server
 mcp = FastMCP("Basic MCP Server")
 
+# Load .env once at startup, before any settings are read
+load_dotenv()
+
 # Initialize the logger and database manager
 logger = Logger()
 db_manager = PostgresDBManager(logger)
 db_manager2 = MongoDBManager(logger)
 db_manager3 = MySQLDBManager(logger)
 base_url= os.environ.get("BASE_URL")
+atexit.register(MongoDBManager.close_all)
+
+# Shared HTTP session so notification calls reuse pooled keep-alive connections
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+)
+_http.mount("https://", _http_adapter)
+_http.mount("http://", _http_adapter)
+HTTP_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Analyzers are created and initialized once, then reused across tool calls
+_analyzers = {}
+_REGISTRY_ANALYZERS = {
+    "mongo": "mongo_analyzer",
+    "mysql": "mysql_analyzer",
+    "postgres": "pg_analyzer",
+}
+# One lock per database type, so retrying an unreachable server only
+# holds up tool calls for that same database
+_analyzer_locks = {type: threading.Lock() for type in _REGISTRY_ANALYZERS}
+INIT_ATTEMPTS = 3
+INIT_BACKOFF = 0.5  # seconds, doubled after each failed attempt
+
+
+def _get_analyzer(type: str):
+    """
+    Return the shared, initialized analyzer for a database type.
+
+    Initialization is retried with exponential backoff so a transient
+    connection failure fails only this request, never the whole server.
+
+    Args:
+        type (str): One of mongo, mysql or postgres.
+
+    Returns:
+        The initialized analyzer, or None if initialization failed.
+    """
+    analyzer = _analyzers.get(type)
+    if analyzer is not None:
+        return analyzer
+    with _analyzer_locks[type]:
+        analyzer = _analyzers.get(type)
+        if analyzer is None:
+            analyzer = getattr(registry, _REGISTRY_ANALYZERS[type])
+            delay = INIT_BACKOFF
+            for attempt in range(1, INIT_ATTEMPTS + 1):
+                if analyzer.initialize():
+                    break
+                logger.add_log(f"❌ {type} initialization attempt {attempt}/{INIT_ATTEMPTS} failed")
+                if attempt == INIT_ATTEMPTS:
+                    return None
+                time.sleep(delay)
+                delay *= 2
+            _analyzers[type] = analyzer
+        return analyzer
 
 
 # Register MCP tools for Logger
 @mcp.tool()
-def db_analyzer(request: str, type:str) -> str:
+async def db_analyzer(request: str, type:str) -> str:
     """
     The tool analyzer Progress, MySQL and Mongo database base on prompt or request.
 
@@ -41,25 +105,25 @@ def db_analyzer(request: str, type:str) -> str:
     """
     result = None
     if type =='mongo':
-        analyzer = MongoDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to Mongo initialization failure. Check logs")
-            sys.exit(1)
-        result = analyzer.process_request(request)
+        analyzer = await asyncio.to_thread(_get_analyzer, "mongo")
+        if analyzer is None:
+            logger.add_log("Mongo initialization failed. Check logs")
+            return "Mongo initialization failed. Check logs for details."
+        result = await analyzer.process_request(request)
     
     elif type =='msql':
-        analyzer = MySQLDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to MySQL initialization failure. Check logs")
-            sys.exit(1)
-        result = analyzer.process_request(request)
+        analyzer = await asyncio.to_thread(_get_analyzer, "mysql")
+        if analyzer is None:
+            logger.add_log("MySQL initialization failed. Check logs")
+            return "MySQL initialization failed. Check logs for details."
+        result = await asyncio.to_thread(analyzer.process_request, request)
 
     elif type =='postgres':
-        analyzer = PostgresDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to Postgres initialization failure. Check logs")
-            sys.exit(1)
-        result = analyzer.process_request(request)
+        analyzer = await asyncio.to_thread(_get_analyzer, "postgres")
+        if analyzer is None:
+            logger.add_log("Postgres initialization failed. Check logs")
+            return "Postgres initialization failed. Check logs for details."
+        result = await asyncio.to_thread(analyzer.process_request, request)
 
     else:
         return f"Unsupported database type: {type}. Supported types are postgres or mongo or mysql."
@@ -68,6 +132,20 @@ def db_analyzer(request: str, type:str) -> str:
         return "Request execution failed. Check logs for details."
     return f"Request executed successfully. Results: {result}"
 
+@mcp.tool()
+def refresh_schema() -> str:
+    """
+    Clear the cached MongoDB schema so the next request reads it again.
+
+    Returns:
+        str: Confirmation message
+    """
+    analyzer = _analyzers.get("mongo")
+    if analyzer is None:
+        return "No MongoDB schema cached yet."
+    analyzer.refresh_schema()
+    return "MongoDB schema cache cleared."
+
 @mcp.tool()
 def add_log(message: str) -> str:
     """
@@ -95,7 +173,7 @@ def get_logs() -> str:
 
 
 @mcp.tool()
-def run_query(query: str, type:str) -> str:
+async def run_query(query: str, type:str) -> str:
     """
     Run a SQL or NoSQL query on the connected database.
 
@@ -109,25 +187,25 @@ def run_query(query: str, type:str) -> str:
     """
 
     if type =='mongo':
-        analyzer = MongoDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to initialization failure. Check logs")
-            sys.exit(1)
-        results = analyzer.db_manager.execute_query(query)
+        analyzer = await asyncio.to_thread(_get_analyzer, "mongo")
+        if analyzer is None:
+            logger.add_log("Mongo initialization failed. Check logs")
+            return "Mongo initialization failed. Check logs for details."
+        results = await analyzer.db_manager.execute_query_async(query)
         # results = analyzer.db_manager.get_collection_schema()
     elif type =='mysql':
-        analyzer = MySQLDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to initialization failure. Check logs")
-            sys.exit(1)
-        results = analyzer.db_manager.execute_query(query)
+        analyzer = await asyncio.to_thread(_get_analyzer, "mysql")
+        if analyzer is None:
+            logger.add_log("MySQL initialization failed. Check logs")
+            return "MySQL initialization failed. Check logs for details."
+        results = await asyncio.to_thread(analyzer.db_manager.execute_query, query)
         # results = analyzer.db_manager.get_collection_schema()
     elif type =='postgres':
-        analyzer = PostgresDBAnalyzer()
-        if not analyzer.initialize():
-            logger.add_log("Exiting due to initialization failure. Check logs")
-            sys.exit(1)
-        results = analyzer.db_manager.execute_query(query)
+        analyzer = await asyncio.to_thread(_get_analyzer, "postgres")
+        if analyzer is None:
+            logger.add_log("Postgres initialization failed. Check logs")
+            return "Postgres initialization failed. Check logs for details."
+        results = await asyncio.to_thread(analyzer.db_manager.execute_query, query)
     else:
         return f"Unsupported database type: {type}. Supported types are postgres or mongo or mysql."
 
@@ -175,7 +253,7 @@ def chat_llm(system_message: str, user_message: str) -> str:
         str: Result from chat prompt
     """
 
-    openai = OpenAIClient()
+    openai = registry.openai
     if not openai.initialize():
         return "OpenAI connection failed. Check logs for details."
     
@@ -202,9 +280,10 @@ def send_email(subject: str, message1: str, email: str, message2: Optional[str]
     """
     try:
         payload = EmailPayload(subject=subject, message1=message1, message2=message2, email=email)
-        response = requests.post(
+        response = _http.post(
             f"{base_url}/send-email-2",
-            json=payload.model_dump(exclude_none=True)
+            json=payload.model_dump(exclude_none=True),
+            timeout=HTTP_TIMEOUT
         )
         response.raise_for_status()
         msg = f"Email sent successfully. Response: {response.text}"
@@ -229,8 +308,9 @@ def send_sms(message: str, phone_number: str) -> str:
     """
     try:
         payload = SMSPayload(message=message, phoneNumber=phone_number)
-        response = requests.post(f"{base_url}/send-sms-2",
-            json=payload.model_dump(exclude_none=True)          )
+        response = _http.post(f"{base_url}/send-sms-2",
+            json=payload.model_dump(exclude_none=True),
+            timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         msg =  f"SMS sent successfully. Response: {response.text}"
         logger.add_log(msg)
@@ -255,9 +335,10 @@ def send_push_notification(message: str, one_signal_ids: List[str], action_name:
     """
     try:
         payload = PushPayload(message=message, oneSignalIds=one_signal_ids, actionName=action_name)
-        response = requests.post(
+        response = _http.post(
              f"{base_url}/push",
-            json=payload.model_dump(exclude_none=True)
+            json=payload.model_dump(exclude_none=True),
+            timeout=HTTP_TIMEOUT
         )
         response.raise_for_status()
         msg = f"Push notification sent successfully. Response: {response.text}"
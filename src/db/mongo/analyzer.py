@@ -1,14 +1,111 @@
 import os
+import re
 import json
+import string
+import time
+import asyncio
 import pandas as pd
 from src.logger import Logger
-from dotenv import load_dotenv
-from .database import MongoDBManager
-from ...utils import format_markdown_table
+from .database import get_mongo_manager
+from ...utils import format_markdown_table, sample_rows, summarize_for_prompt, json_dumps, json_loads, records_to_dataframe, MongoConfig
 from ...llm.openai_client import OpenAIClient
+from ...registry import registry
 from typing import Dict, Optional, Any, List, Tuple
-from ...visualization import create_visualization
-load_dotenv()
+from ...visualization import create_visualization, VISUALIZATION_RE
+MONGO_CFG = MongoConfig.from_env()
+
+# Read-only operations the LLM is allowed to generate
+_SAFE_OPERATIONS = frozenset({"find", "aggregate", "count", "distinct"})
+# Operators that write data or run arbitrary server-side code
+_UNSAFE_STAGES = frozenset({"$out", "$merge", "$function"})
+# Spots the operation field in a partially streamed query
+_OPERATION_RE = re.compile(r'"operation"\s*:\s*"([^"]*)"')
+
+# Prompts are fixed templates so identical requests produce identical text,
+# which lets the OpenAI client answer repeats from its completion cache.
+# The translation system message emphasizes read-only operations.
+_TRANSLATE_SYSTEM = """You are an expert at translating natural language to MongoDB READ-ONLY queries. 
+        Only return the MongoDB query in a valid JSON format without any explanations, comments or markdown formatting.
+        The query should include both the collection name and the query parameters.
+        IMPORTANT: You must ONLY generate READ-ONLY queries (find, aggregate, count, distinct).
+        Never generate queries that modify the database (insert, update, delete, remove, replaceOne, updateOne, etc)."""
+_TRANSLATE_PROMPT = string.Template("""
+        Here is the MongoDB database schema information:
+        ```json
+        ${schema_context}
+        ```
+        
+        Natural language request: "${request}"
+        
+        Your task is to write a MongoDB READ-ONLY query that will answer this request.
+        Return ONLY the MongoDB query as a JSON object with these fields:
+        1. "collection": the name of the collection to query
+        2. "operation": the type of operation (MUST be one of: find, aggregate, count, distinct)
+        3. "query": the query filter parameters
+        4. "projection": fields to include/exclude (optional)
+        5. "sort": sort specification (optional)
+        6. "limit": number of results to return (optional)
+        
+        Do not include any explanations or text outside the JSON object.
+        NEVER generate any operations that would modify the database (insert, update, delete, etc).
+        If the request implies a modification operation, return a query that would show the relevant data instead.
+        """)
+_ANALYZE_SYSTEM = """You are an expert data analyst specializing in database analysis. 
+        Provide insightful, actionable analysis based on the data. Format your response in well-structured markdown."""
+_ANALYZE_PROMPT = string.Template("""
+        You've been provided with data from a MongoDB query. 
+        
+        The user's request was: "${request}"
+        
+        Here's a sample of the data:
+        ```
+        ${data_description}
+        ```
+        
+        Statistical summary:
+        ```
+        ${data_stats}
+        ```
+        
+        Please provide a detailed analysis addressing the user's request. Include:
+        1. Key insights and findings
+        2. Trends or patterns identified
+        3. Actionable recommendations based on the data
+        4. Any anomalies or important observations
+        
+        Your analysis should be thorough yet concise, with clear sections and bullet points where appropriate.
+        Format the response in markdown with proper headings and structure.
+        """)
+
+
+def _find_unsafe_operator(node: Any) -> Optional[str]:
+    """
+    Walk a parsed MongoDB query and return the first unsafe operator in it.
+    
+    Every dict key, at any depth, is compared exactly against _UNSAFE_STAGES;
+    values are only descended into, never matched, so field names and values
+    that merely contain words like "insert" or "update" are not rejected.
+    
+    Args:
+        node: Parsed query, pipeline or any nested part of them
+        
+    Returns:
+        The unsafe operator name, or None if the query is read-only
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in _UNSAFE_STAGES:
+                return key
+            found = _find_unsafe_operator(value)
+            if found:
+                return found
+    elif isinstance(node, list):
+        for item in node:
+            found = _find_unsafe_operator(item)
+            if found:
+                return found
+    return None
+
 
 class MongoDBAnalyzer:
     """MongoDB analyzer that uses LLMs to translate natural language to MongoDB queries and analyze results."""
@@ -16,21 +113,33 @@ class MongoDBAnalyzer:
     def __init__(
         self, 
         openai_model: str = "gpt-4o-mini",
+        schema_ttl: float = 300.0,
+        openai_client: Optional[OpenAIClient] = None,
     ):
         """
         Initialize the MongoDB Analyzer.
         
         Args:
             openai_model: OpenAI model to use
+            openai_client: Client to use; defaults to the shared registry client
+            schema_ttl: Seconds to reuse the serialized schema before re-fetching it
         """
 
         logger = Logger()
         openai_api_key = os.environ.get("OPENAI_API_KEY")
-        self.db_manager = MongoDBManager(logger)
+        self.db_manager = get_mongo_manager(logger, query_cache_size=MONGO_CFG.query_cache_size)
         self.logger = logger
        
-        self.openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        if openai_client is None:
+            # Share one HTTP client across analyzers unless a different model is requested
+            if openai_model == registry.openai.model:
+                openai_client = registry.openai
+            else:
+                openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        self.openai_client = openai_client
         # self.mcp_client = MCPClient(api_key=mcp_api_key)
+        self.schema_ttl = schema_ttl
+        self._schema_cache: Optional[Tuple[float, str]] = None
         
     def initialize(self) -> bool:
         """
@@ -39,17 +148,77 @@ class MongoDBAnalyzer:
         Returns:
             bool: True if all connections successful, False otherwise
         """
-        connection_string = os.environ.get("MONGODB_CONNECTION_STRING")
-        db_name = os.environ.get("MONGODB_DATABASE")
+        if MONGO_CFG.error:
+            self.logger.add_log(f"❌ MongoDB configuration error: {MONGO_CFG.error}")
+            return False
 
-        db_success = self.db_manager.connect(connection_string, db_name)
+        # The shared manager keeps its pool open, so only connect once
+        db_success = self.db_manager.client is not None or self.db_manager.connect(
+            MONGO_CFG.connection_string, MONGO_CFG.database
+        )
+        if db_success and MONGO_CFG.watch_schema:
+            # Keeps the collection info cache current between TTL refreshes
+            self.db_manager.watch_schema_changes()
         openai_success = self.openai_client.initialize()
         # mcp_success = self.mcp_client.initialize()
             
         return db_success and openai_success # and mcp_success
     
+    def get_schema_context(self) -> str:
+        """
+        Get the serialized collection schema used in LLM prompts.
+        
+        The schema rarely changes, so the serialized string is cached and
+        reused until it is older than schema_ttl or refresh_schema is called.
+        
+        Returns:
+            JSON string describing the database collections
+        """
+        cached = self._schema_cache
+        if cached and time.monotonic() - cached[0] < self.schema_ttl:
+            return cached[1]
+        
+        return self._store_schema_context(self.db_manager.get_collection_info())
+    
+    async def get_schema_context_async(self) -> str:
+        """
+        Awaitable get_schema_context that fetches the collection info without blocking the loop.
+        
+        Returns:
+            JSON string describing the database collections
+        """
+        cached = self._schema_cache
+        if cached and time.monotonic() - cached[0] < self.schema_ttl:
+            return cached[1]
+        
+        schema_info = await self.db_manager.get_collection_info_async()
+        return await asyncio.to_thread(self._store_schema_context, schema_info)
+    
+    def _store_schema_context(self, schema_info: Dict[str, Any]) -> str:
+        """
+        Serialize collection info for prompts and cache the result.
+        
+        The columnar summary repeats the per-collection statistics for
+        programmatic callers, so it is left out of the prompt.
+        
+        Args:
+            schema_info: Result of get_collection_info
+            
+        Returns:
+            JSON string describing the database collections
+        """
+        prompt_info = {key: value for key, value in schema_info.items() if key != "summary"}
+        schema_context = json_dumps(prompt_info, indent=True, sort_keys=True)
+        self._schema_cache = (time.monotonic(), schema_context)
+        return schema_context
+    
+    def refresh_schema(self) -> None:
+        """Drop the cached schema so the next request fetches it again."""
+        self._schema_cache = None
+        self.db_manager.invalidate_collection_info()
+        self.logger.add_log("MongoDB schema cache cleared")
 
-    def translate_to_mongodb_query(self, request: str) -> Optional[Dict[str, Any]]:
+    async def translate_to_mongodb_query(self, request: str) -> Optional[Dict[str, Any]]:
         """
         Translate natural language request to MongoDB query using LLM.
         Only allows read-only operations (find, aggregate, count, distinct).
@@ -60,65 +229,26 @@ class MongoDBAnalyzer:
         Returns:
             MongoDB query dictionary or None if translation failed or unsafe operation detected
         """
-        schema_info = self.db_manager.get_collection_info()
-        schema_context = json.dumps(schema_info, indent=2)
+        schema_context = await self.get_schema_context_async()
         
-        # Enhanced system message to emphasize read-only operations
-        system_message = """You are an expert at translating natural language to MongoDB READ-ONLY queries. 
-        Only return the MongoDB query in a valid JSON format without any explanations, comments or markdown formatting.
-        The query should include both the collection name and the query parameters.
-        IMPORTANT: You must ONLY generate READ-ONLY queries (find, aggregate, count, distinct).
-        Never generate queries that modify the database (insert, update, delete, remove, replaceOne, updateOne, etc)."""
-        
-        prompt = f"""
-        Here is the MongoDB database schema information:
-        ```json
-        {schema_context}
-        ```
-        
-        Natural language request: "{request}"
-        
-        Your task is to write a MongoDB READ-ONLY query that will answer this request.
-        Return ONLY the MongoDB query as a JSON object with these fields:
-        1. "collection": the name of the collection to query
-        2. "operation": the type of operation (MUST be one of: find, aggregate, count, distinct)
-        3. "query": the query filter parameters
-        4. "projection": fields to include/exclude (optional)
-        5. "sort": sort specification (optional)
-        6. "limit": number of results to return (optional)
+        prompt = _TRANSLATE_PROMPT.substitute(schema_context=schema_context, request=request)
         
-        Do not include any explanations or text outside the JSON object.
-        NEVER generate any operations that would modify the database (insert, update, delete, etc).
-        If the request implies a modification operation, return a query that would show the relevant data instead.
-        """
-        
-        query_json = self.openai_client.generate_completion(
-            system_message=system_message,
-            user_message=prompt,
-            temperature=0
-        )
+        query_json = await asyncio.to_thread(self._stream_query_json, _TRANSLATE_SYSTEM, prompt)
         
         if query_json:
             try:
-                query_dict = json.loads(query_json.strip())
-                
-                # Explicit whitelist of safe operations
-                SAFE_OPERATIONS = ["find", "aggregate", "count", "distinct"]
+                query_dict = json_loads(query_json)
                 
                 # Check if the operation is one of the safe operations
-                if "operation" not in query_dict or query_dict["operation"] not in SAFE_OPERATIONS:
+                if not isinstance(query_dict, dict) or query_dict.get("operation") not in _SAFE_OPERATIONS:
                     self.logger.add_log("❌ Unsafe or missing MongoDB operation detected. Aborting.")
                     return None
                     
-                # Look for any keywords that might indicate modification operations in the query or aggregation
-                query_str = json.dumps(query_dict).lower()
-                unsafe_keywords = ["$out", "$merge", "insert", "update", "delete", "remove", "replace", 
-                                "createindex", "dropindex", "dropcollection", "createcollection"]
-                
-                for keyword in unsafe_keywords:
-                    if keyword in query_str:
-                        self.logger.add_log(f"❌ Potentially unsafe operation detected: {keyword}. Aborting.")
-                        return None
+                # Look for operators that write data anywhere in the query or aggregation
+                unsafe_operator = _find_unsafe_operator(query_dict)
+                if unsafe_operator:
+                    self.logger.add_log(f"❌ Potentially unsafe operation detected: {unsafe_operator}. Aborting.")
+                    return None
                 
                 self.logger.add_log("✅ Generated safe MongoDB query from natural language request")
                 return query_dict
@@ -131,7 +261,43 @@ class MongoDBAnalyzer:
         return None
     
     
-    def analyze_data(self, data: pd.DataFrame, request: str) -> Optional[str]:
+    def _stream_query_json(self, system_message: str, prompt: str) -> Optional[str]:
+        """
+        Stream the generated query JSON, stopping early on an unsafe operation.
+        
+        The "operation" field is checked as soon as it appears in the stream,
+        so a disallowed query is rejected without waiting for the rest of it.
+        
+        Args:
+            system_message: System message for the LLM
+            prompt: User prompt for the LLM
+            
+        Returns:
+            The complete JSON text, or None if generation failed or was aborted
+        """
+        chunks = self.openai_client.stream_completion(
+            system_message=system_message,
+            user_message=prompt,
+            temperature=0,
+            cache=True
+        )
+        buffer = ""
+        operation_checked = False
+        try:
+            for text in chunks:
+                buffer += text
+                if not operation_checked:
+                    match = _OPERATION_RE.search(buffer)
+                    if match:
+                        operation_checked = True
+                        if match.group(1) not in _SAFE_OPERATIONS:
+                            self.logger.add_log(f"❌ Unsafe MongoDB operation '{match.group(1)}' detected while streaming. Aborting.")
+                            return None
+        finally:
+            chunks.close()
+        return buffer or None
+    
+    async def analyze_data(self, data: pd.DataFrame, request: str) -> Optional[str]:
         """
         Generate insights from query results using LLM.
         
@@ -145,45 +311,20 @@ class MongoDBAnalyzer:
         if data is None or data.empty:
             return "No data available for analysis."
             
-        # Convert data to string representation
-        data_description = data.head(100).to_string()
-        if len(data) > 100:
-            data_description += f"\n\n[Note: showing only first 100 rows of {len(data)} total rows]"
-            
-        data_stats = data.describe().to_string() if not data.empty else "No statistical data available."
-            
-        system_message = """You are an expert data analyst specializing in database analysis. 
-        Provide insightful, actionable analysis based on the data. Format your response in well-structured markdown."""
-        
-        prompt = f"""
-        You've been provided with data from a MongoDB query. 
-        
-        The user's request was: "{request}"
-        
-        Here's a sample of the data:
-        ```
-        {data_description}
-        ```
-        
-        Statistical summary:
-        ```
-        {data_stats}
-        ```
+        data_description, data_stats = summarize_for_prompt(data)
         
-        Please provide a detailed analysis addressing the user's request. Include:
-        1. Key insights and findings
-        2. Trends or patterns identified
-        3. Actionable recommendations based on the data
-        4. Any anomalies or important observations
-        
-        Your analysis should be thorough yet concise, with clear sections and bullet points where appropriate.
-        Format the response in markdown with proper headings and structure.
-        """
+        prompt = _ANALYZE_PROMPT.substitute(
+            request=request,
+            data_description=data_description,
+            data_stats=data_stats
+        )
         
-        analysis = self.openai_client.generate_completion(
-            system_message=system_message,
+        analysis = await asyncio.to_thread(
+            self.openai_client.generate_completion,
+            system_message=_ANALYZE_SYSTEM,
             user_message=prompt,
-            temperature=0.2
+            temperature=0.2,
+            cache=True
         )
         
         if analysis:
@@ -202,15 +343,14 @@ class MongoDBAnalyzer:
         Returns:
             True if visualization should be generated
         """
-        visualization_keywords = [
-            'chart', 'graph', 'plot', 'visualize', 'visualization', 
-            'distribution', 'trend', 'compare', 'show me'
-        ]
-        return any(keyword in request.lower() for keyword in visualization_keywords)
+        return VISUALIZATION_RE.search(request) is not None
     
-    def process_request(self, request: str) -> Dict[str, Any]:
+    async def process_request(self, request: str) -> Dict[str, Any]:
         """
         Process a natural language request end-to-end.
+
+        The LLM analysis, the visualization and the sample table only depend
+        on the query results, so they run concurrently once data is available.
         
         Args:
             request: Natural language request
@@ -231,16 +371,17 @@ class MongoDBAnalyzer:
         }
         
         # Generate MongoDB query from request
-        mongo_query = self.translate_to_mongodb_query(request)
+        mongo_query = await self.translate_to_mongodb_query(request)
         if not mongo_query:
             result["error"] = "Failed to translate your request to a MongoDB query. Please try rephrasing or provide more details."
             return result
         
         result["mongodb_query"] = mongo_query
-        self.logger.add_log(f"🔍 Generated MongoDB query: {json.dumps(mongo_query, indent=2)}")
+        self.logger.add_log(f"🔍 Generated MongoDB query: {json_dumps(mongo_query)}")
         
         # Execute the query
-        data = self.db_manager.execute_query(
+        data = await asyncio.to_thread(
+            self.db_manager.execute_query,
             collection=mongo_query.get("collection"),
             operation=mongo_query.get("operation", "find"),
             query=mongo_query.get("query", {}),
@@ -261,7 +402,8 @@ class MongoDBAnalyzer:
                 data = pd.DataFrame([{"count": data}])
             elif isinstance(data, list):  # For distinct operations or list results
                 if all(isinstance(item, dict) for item in data):
-                    data = pd.DataFrame(data)
+                    # Building a frame from many documents is CPU-bound; keep it off the event loop
+                    data = await asyncio.to_thread(records_to_dataframe, data)
                 else:
                     data = pd.DataFrame({"values": data})
             else:
@@ -270,26 +412,35 @@ class MongoDBAnalyzer:
         
         self.logger.add_log(f"✅ Processed {len(data)} rows of data")
         
-        # Generate analysis
-        analysis = self.analyze_data(data, request)
-        if not analysis:
+        # Generate analysis, visualization and sample data concurrently
+        sample_data = sample_rows(data)
+        if self.should_visualize(request):
+            visualization_step = asyncio.to_thread(create_visualization, data, request)
+        else:
+            visualization_step = asyncio.sleep(0)  # Resolves to None
+        
+        analysis, visualization, sample_table = await asyncio.gather(
+            self.analyze_data(data, request),
+            visualization_step,
+            asyncio.to_thread(format_markdown_table, sample_data),
+            return_exceptions=True
+        )
+
+        if isinstance(analysis, Exception) or not analysis:
             result["error"] = "Failed to generate analysis from the data."
             return result
         
         result["analysis"] = analysis
         
-        # Check if we should generate a visualization
-        if self.should_visualize(request):
-            try:
-                visualization = create_visualization(data, request)
-                if visualization:
-                    result["visualization"] = visualization
-            except Exception as e:
-                print(f"⚠️ Warning: Failed to generate visualization: {e}")
+        if isinstance(visualization, Exception):
+            print(f"⚠️ Warning: Failed to generate visualization: {visualization}")
+        elif visualization:
+            result["visualization"] = visualization
         
         # Include sample data
-        sample_data = data.head(10) if len(data) > 10 else data
-        result["sample_data"] = format_markdown_table(sample_data)
+        if isinstance(sample_table, Exception):
+            raise sample_table
+        result["sample_data"] = sample_table
         
         result["success"] = True
         return result
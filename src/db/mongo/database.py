@@ -2,35 +2,504 @@
 MongoDB database connection and query management.
 """
 import re
+import copy
+import math
+import pickle
+import asyncio
+import time
+import hashlib
+import warnings
+import functools
+from collections import OrderedDict
+from collections.abc import Mapping
+from urllib.parse import urlsplit, unquote
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pymongo
+from pymongo.collection import Collection
+from pymongo.compression_support import validate_compressors
+from pymongo.cursor import Cursor
+from pymongo.command_cursor import CommandCursor
+from pymongo.errors import OperationFailure
+import numpy as np
 import pandas as pd
-from src.logger import Logger
-from typing import Dict, List, Optional, Any, Union
+from src.logger import Logger, NEWLINES_TO_SPACES
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from bson import json_util
-import json
+
+# MongoClients are expensive to build (DNS/SRV lookup, TLS, topology discovery)
+# and thread-safe, so one client per connection target is shared process-wide
+_CLIENT_CACHE: Dict[tuple, pymongo.MongoClient] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _client_key(connection_string: Optional[str], connection_params: Dict[str, Any]) -> tuple:
+    """
+    Build the cache key identifying a MongoClient configuration.
+    
+    Args:
+        connection_string: MongoDB connection string URI, if any
+        connection_params: Keyword arguments passed to MongoClient
+        
+    Returns:
+        Hashable key; option values are compared by repr so lists are allowed
+    """
+    target = connection_string or (
+        connection_params.get("host"),
+        connection_params.get("port"),
+        connection_params.get("username"),
+    )
+    options = tuple(sorted((name, repr(value)) for name, value in connection_params.items()))
+    return (target, options)
+
+
+def _default_compressors() -> str:
+    """
+    List the wire compressors this installation supports, best first.
+    
+    zstd and snappy need optional packages; pymongo warns and drops any
+    that are missing, so they are filtered here once and quietly instead.
+    
+    Returns:
+        Comma-separated compressor names, e.g. "zstd,zlib"
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ",".join(validate_compressors(None, "zstd,snappy,zlib"))
+
+
+_DEFAULT_COMPRESSORS = _default_compressors()
+
+
+# Relaxed Extended JSON keeps numbers and dates compact ({"$date": "2024-..."}).
+# It is pymongo 4's default, but older drivers default to the verbose forms.
+JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+_bson_default = functools.partial(json_util.default, json_options=JSON_OPTIONS)
+
+
+# Exact types only: bson.Code subclasses str and Int64 subclasses int
+_JSON_SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def _bson_to_jsonable(obj: Any) -> Any:
+    """
+    Walk a BSON value and convert it to Relaxed Extended JSON in one pass.
+    
+    Produces the same structure as json.loads(json_util.dumps(obj)) without
+    building and re-parsing an intermediate JSON string.
+    
+    Args:
+        obj: Document, list or scalar returned by pymongo
+        
+    Returns:
+        Equivalent structure built only from dicts, lists, strings and numbers
+    """
+    if type(obj) in _JSON_SCALARS:
+        return obj
+    if type(obj) is float:
+        # Relaxed mode only wraps the values JSON cannot represent
+        return obj if math.isfinite(obj) else _bson_default(obj)
+    if isinstance(obj, (dict, Mapping)):
+        return {str(key): _bson_to_jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_bson_to_jsonable(value) for value in obj]
+    converted = _bson_default(obj)
+    # Subclasses of plain JSON types (e.g. IntEnum) come back unchanged
+    return obj if converted is obj else _bson_to_jsonable(converted)
+
+
+def _truncate_strings(value: Any, limit: int) -> Any:
+    """
+    Shorten every string in a JSON-compatible structure to at most limit characters.
+    
+    Args:
+        value: Output of _to_jsonable
+        limit: Maximum string length to keep
+        
+    Returns:
+        The same structure with long strings cut and marked with an ellipsis
+    """
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit] + "…"
+    if isinstance(value, dict):
+        return {key: _truncate_strings(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(item, limit) for item in value]
+    return value
+
+
+def _to_jsonable(result: Any) -> Any:
+    """
+    Convert BSON query results into plain JSON-compatible Python objects.
+    
+    BSON-only types become their Relaxed Extended JSON form ({"$oid": ...},
+    {"$date": ...}, {"$numberDouble": "NaN"}). This always goes through
+    _bson_to_jsonable: orjson turns non-finite floats into null and drops
+    the {"$code": ...} wrapper of str subclasses such as bson.Code, so its
+    output would depend on whether it happens to be installed.
+    
+    Args:
+        result: Documents or values returned by pymongo
+        
+    Returns:
+        Equivalent structure built only from dicts, lists, strings and numbers
+    """
+    return _bson_to_jsonable(result)
+
+
+def _collection_summary(collections_info: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Lay the per-collection statistics out as parallel columns.
+    
+    Ranking or filtering collections, e.g. the ten largest with
+    np.argpartition(summary["sizes"], -10)[-10:], then scans contiguous
+    int64 arrays instead of one dict per collection.
+    
+    Args:
+        collections_info: The "collections" mapping of get_collection_info
+        
+    Returns:
+        Dictionary with names plus int64 arrays counts, sizes and storage_sizes
+        aligned with it; collections without statistics are left out
+    """
+    names = [name for name, info in collections_info.items() if "error" not in info and "count" in info]
+    stats = [collections_info[name] for name in names]
+    return {
+        "names": names,
+        "counts": np.array([info.get("count", 0) for info in stats], dtype=np.int64),
+        "sizes": np.array([info.get("size", 0) for info in stats], dtype=np.int64),
+        "storage_sizes": np.array([info.get("storageSize", 0) for info in stats], dtype=np.int64),
+    }
+
+
+# Documents sampled per collection when inferring its schema
+SCHEMA_SAMPLE_SIZE = 100
+# Samples documents and returns one {_id: field, types: [BSON type names]} per field
+_SCHEMA_TYPES_PIPELINE = [
+    {"$sample": {"size": SCHEMA_SAMPLE_SIZE}},
+    {"$project": {"kv": {"$objectToArray": "$$ROOT"}}},
+    {"$unwind": "$kv"},
+    {"$group": {"_id": "$kv.k", "types": {"$addToSet": {"$type": "$kv.v"}}}},
+]
+# Sample documents returned per collection by get_collection_info
+PROBE_SAMPLE_SIZE = 5
+# Longest string kept in a sample document; longer text and binary payloads are cut
+SAMPLE_STRING_LIMIT = 256
+# $sample only uses a random cursor when it asks for under 5% of the collection;
+# below this many documents it sorts the whole collection instead
+_RANDOM_SAMPLE_MIN_COUNT = PROBE_SAMPLE_SIZE * 20
+# Change stream events that alter the set or shape of collections
+_DDL_EVENTS = ["create", "drop", "rename", "modify", "dropDatabase", "createIndexes", "dropIndexes"]
+# Milliseconds the schema watcher waits for an event before checking it should keep running
+_WATCH_AWAIT_MS = 1000
+# listCollections filter that leaves out system.* namespaces
+_USER_COLLECTIONS_FILTER = {"name": {"$not": re.compile(r"^system\.")}}
+# Documents fetched per round trip when draining find/aggregate cursors
+RESULT_BATCH_SIZE = 1000
+# Threads execute_query_async runs queries on
+QUERY_THREADS = 16
+# Whitelisted metadata commands whose replies are cached by name and argument
+_METADATA_COMMANDS = frozenset({"listIndexes", "buildInfo", "hostInfo", "serverInfo"})
+# Read operations whose results execute_query may cache; status commands
+# such as serverStatus, ping or dbStats always go to the server
+_CACHEABLE_OPERATIONS = frozenset({
+    "find", "findOne", "aggregate", "count", "countDocuments", "estimatedDocumentCount", "distinct"
+})
+
+
+# Aggregation stages that write their output to a collection
+_UNSAFE_STAGES = frozenset({"$out", "$merge"})
+
+
+def _find_unsafe_stage(pipeline: List[Any]) -> Optional[Any]:
+    """
+    Return the first aggregation stage that writes data, or None.
+    
+    Args:
+        pipeline: Aggregation pipeline
+        
+    Returns:
+        The offending stage, or None if the pipeline is read-only
+    """
+    for stage in pipeline:
+        if isinstance(stage, dict) and not _UNSAFE_STAGES.isdisjoint(stage):
+            return stage
+    return None
+
+
+def _is_stage(stage: Any, name: str) -> bool:
+    """Check whether a pipeline stage is exactly the given operator, e.g. {"$match": {...}}."""
+    return isinstance(stage, dict) and len(stage) == 1 and name in stage
+
+
+# Shell helpers that map directly onto a read-only call, keyed by lowercased command
+_STRING_DISPATCH = {
+    "show collections": lambda manager: manager.db.list_collection_names(),
+    "db.getcollectionnames()": lambda manager: manager.db.list_collection_names(),
+    "show dbs": lambda manager: manager.client.list_database_names(),
+    "show databases": lambda manager: manager.client.list_database_names(),
+    "db stats": lambda manager: manager.db.command("dbstats"),
+    "db.stats()": lambda manager: manager.db.command("dbstats"),
+    "show profile": lambda manager: manager.db.command("profile", -1),
+    "db.getprofilingstatus()": lambda manager: manager.db.command("profile", -1),
+    "db.version()": lambda manager: manager.db.command("buildInfo").get("version"),
+}
+SAFE_STRING_COMMANDS = frozenset(_STRING_DISPATCH)
+
+SAFE_DICT_OPERATIONS = frozenset({
+    # Read-only collection operations
+    "find", "count", "distinct", "aggregate", "findOne", "countDocuments", "estimatedDocumentCount",
+    # Read-only database commands
+    "listCollections", "dbstats", "collstats", "dataSize", "dbStats", "ping", "hostInfo", "serverInfo",
+    "listIndexes", "getParameter", "buildInfo", "connectionStatus", "serverStatus", "validate", "profile"
+})
+
+# Words that indicate a write, matched in one case-insensitive pass. The word
+# boundaries already keep operators like $dateToString or $createDate from
+# matching, so they don't need to be stripped out first. Words sharing a stem
+# are factored (create, createIndex, createCollection) so each is tried once.
+_UNSAFE_RE = re.compile(
+    r"\b(?:insert|update|delete|remove|replace|mapreduce"
+    r"|create(?:index|collection)?|drop(?:index)?|rename(?:collection)?)\b"
+    r"|\$(?:out|merge)\b",
+    re.IGNORECASE
+)
+
+
+def _contains_unsafe_operations(cmd_str: str) -> bool:
+    """
+    Check a command string for keywords that would modify the database.
+    
+    Args:
+        cmd_str: Command text
+        
+    Returns:
+        True if the command looks like a write
+    """
+    return _UNSAFE_RE.search(cmd_str) is not None
+
+
+def _document_has_unsafe_operations(node: Any) -> bool:
+    """
+    Check a command document's keys and string values for write keywords.
+    
+    Walks the parsed structure directly instead of serializing it to JSON
+    first, and stops at the first match.
+    
+    Args:
+        node: Command document, or any value nested inside it
+        
+    Returns:
+        True if the document looks like a write
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(key, str) and _UNSAFE_RE.search(key):
+                return True
+            if _document_has_unsafe_operations(value):
+                return True
+        return False
+    if isinstance(node, (list, tuple)):
+        return any(_document_has_unsafe_operations(item) for item in node)
+    if isinstance(node, str):
+        return _UNSAFE_RE.search(node) is not None
+    return False
+
+
+# Shell syntax that isn't JSON, rewritten before a second parse attempt.
+# Keys are only quoted right after "{" or "," so colons inside values
+# such as "http://..." are left alone.
+_UNQUOTED_KEY_RE = re.compile(r'([{,]\s*)([A-Za-z_$][\w$]*)(\s*:)')
+_OBJECT_ID_RE = re.compile(r'ObjectId\(\s*["\']([0-9a-fA-F]{24})["\']\s*\)')
+_ISODATE_RE = re.compile(r'(?:ISODate|new\s+Date)\(\s*["\']([^"\']+)["\']\s*\)')
+
+
+def _isodate_to_extended_json(match: re.Match) -> str:
+    """Rewrite ISODate("...") as {"$date": "..."}, giving bare dates a midnight UTC time."""
+    value = match.group(1)
+    if len(value) == 10:
+        value += "T00:00:00Z"
+    return f'{{"$date": "{value}"}}'
+
+
+@functools.lru_cache(maxsize=256)
+def _shell_to_extended_json(params_str: str) -> str:
+    """
+    Rewrite mongo shell parameter syntax as Extended JSON.
+    
+    The rewritten text is cached, since the same shell-style filters keep
+    coming back; the parsed values are not, as the driver receives them
+    as mutable dicts.
+    
+    Args:
+        params_str: Parameter text between the call parentheses
+        
+    Returns:
+        Text with ObjectId(...) and ISODate(...) wrapped and bare keys quoted
+    """
+    fixed = _OBJECT_ID_RE.sub(r'{"$oid": "\1"}', params_str)
+    fixed = _ISODATE_RE.sub(_isodate_to_extended_json, fixed)
+    return _UNQUOTED_KEY_RE.sub(r'\1"\2"\3', fixed)
+
+
+# db.<collection>.<operation chain>; the collection is everything up to the next dot
+_DB_SHELL_RE = re.compile(r"db\.([^.]+)\.(.*)", re.DOTALL)
+# Tokens that give a shell command its structure. Quoted strings are matched
+# whole so brackets inside them are skipped, and runs of other characters
+# are passed over inside the regex engine instead of one by one in Python.
+_STRING_TOKEN = r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\''
+_CALL_TOKEN_RE = re.compile(_STRING_TOKEN + r'|[().]')
+_ARG_TOKEN_RE = re.compile(_STRING_TOKEN + r'|[{}\[\](),]')
+
+
+def _split_top_level_args(params: str) -> List[str]:
+    """
+    Split call parameters on the commas that are not nested in brackets or strings.
+    
+    Args:
+        params: Parameter text between the call parentheses
+        
+    Returns:
+        Stripped argument strings; empty if params is blank
+    """
+    args = []
+    depth = 0
+    start = 0
+    for match in _ARG_TOKEN_RE.finditer(params):
+        token = match.group()
+        if token in "{[(":
+            depth += 1
+        elif token in "}])":
+            depth -= 1
+        elif token == "," and depth == 0:
+            args.append(params[start:match.start()].strip())
+            start = match.end()
+    last = params[start:].strip()
+    if last or args:
+        args.append(last)
+    return args
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_shell_command(cmd: str):
+    """
+    Split db.collection.op(params).chained(params) into its parts.
+    
+    Results are cached by command string, since dashboards resend the same
+    commands over and over.
+    
+    Args:
+        cmd: Shell-style command string
+        
+    Returns:
+        Tuple of (collection_name, primary_op, primary_params, chained_ops),
+        where chained_ops is a tuple of (op_name, params) pairs, or four Nones
+        if the command cannot be parsed
+    """
+    # Extract collection and operation parts
+    match = _DB_SHELL_RE.match(cmd)
+    if match is None:
+        return None, None, None, None
+    collection_name, operation_part = match.groups()
+    
+    # Fast path for a single unchained call like find({...}): slice around the
+    # only pair of parentheses instead of scanning character by character
+    lp = operation_part.find("(")
+    if lp > 0 and operation_part.endswith(")") and operation_part.find("(", lp + 1) < 0:
+        primary_op = operation_part[:lp].strip()
+        params = operation_part[lp + 1:-1]
+        if "." not in primary_op and ")" not in params:
+            return collection_name, primary_op, params.strip(), ()
+    
+    # Handle cases like db.collection.find({...}).sort({...}).limit(10),
+    # visiting only brackets, dots and quoted strings
+    op_chain = []
+    depth = 0
+    name_start = 0
+    param_start = -1
+    op_name = ""
+    
+    for match in _CALL_TOKEN_RE.finditer(operation_part):
+        token = match.group()
+        if token == "(":
+            if depth == 0:
+                # Start of parameters
+                op_name = operation_part[name_start:match.start()].strip()
+                param_start = match.end()
+            depth += 1
+        elif token == ")":
+            if depth > 0:
+                depth -= 1
+                if depth == 0:
+                    # End of parameters
+                    op_chain.append((op_name, operation_part[param_start:match.start()].strip()))
+                    name_start = match.end()
+        elif token == "." and depth == 0:
+            # Next operation in chain
+            name_start = match.end()
+    
+    if not op_chain:
+        return None, None, None, None
+    
+    primary_op, primary_params = op_chain[0]
+    # Immutable, because the result is shared by every caller of the cache
+    chained_ops = tuple(op_chain[1:])
+    
+    return collection_name, primary_op, primary_params, chained_ops
 
 
 class MongoDBManager:
     """Class for managing database connections to MongoDB."""
     
-    def __init__(self, logger: Logger, connection_params: Dict[str, Any] = None):
+    def __init__(self, logger: Logger, connection_params: Dict[str, Any] = None,
+                 query_cache_size: int = 0, query_cache_ttl: float = 30.0):
         """
         Initialize the MongoDB manager with connection parameters.
         
         Args:
             logger (Logger): Logger instance for logging operations
-            connection_params (Dict[str, Any], optional): Dictionary of connection parameters
+            connection_params (Dict[str, Any], optional): Dictionary of connection parameters.
+                May also hold defaultFindLimit and defaultMaxTimeMS for shell-style find(),
+                and statsCollectionLimit for get_collection_info.
+            query_cache_size (int, optional): find/aggregate/count/distinct results kept by
+                execute_query; 0 (the default) disables the cache
+            query_cache_ttl (float, optional): Seconds a cached query result stays valid
         """
         self.logger = logger
         self.connection_params = connection_params or {}
+        # Safety limits for shell-style find(); popped so MongoClient never sees them
+        self.default_find_limit = self.connection_params.pop('defaultFindLimit', 10000)
+        self.default_max_time_ms = self.connection_params.pop('defaultMaxTimeMS', 30000)
+        # Above this many collections get_collection_info reports fields only
+        self.stats_collection_limit = self.connection_params.pop('statsCollectionLimit', 200)
         # Set default timeout values if not provided
-        if 'connectTimeoutMS' not in self.connection_params:
-            self.connection_params['connectTimeoutMS'] = 60000  # Default 60 seconds for connection timeout
-        if 'socketTimeoutMS' not in self.connection_params:
-            self.connection_params['socketTimeoutMS'] = 300000  # Default 5 minutes for operation timeout
+        self.connection_params.setdefault('connectTimeoutMS', 60000)  # Default 60 seconds for connection timeout
+        self.connection_params.setdefault('socketTimeoutMS', 300000)  # Default 5 minutes for operation timeout
+        # Pool settings so requests borrow an idle socket instead of reconnecting
+        self.connection_params.setdefault('maxPoolSize', 200)
+        self.connection_params.setdefault('minPoolSize', 10)  # Kept warm by the driver's background pool maintenance
+        self.connection_params.setdefault('maxIdleTimeMS', 300000)  # Default 5 minutes before an idle socket is closed
+        self.connection_params.setdefault('waitQueueTimeoutMS', 10000)  # Fail fast instead of queueing forever when the pool is exhausted
+        self.connection_params.setdefault('retryReads', True)
+        self.connection_params.setdefault('serverSelectionTimeoutMS', 3000)
+        self.connection_params.setdefault('retryWrites', True)
         self.client = None
         self.db = None
         self.collection_schema = {}
+        self._collection_names_cache: Optional[Tuple[float, List[str]]] = None
+        self._info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._info_ttl = 60.0
+        self._meta_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._meta_ttl = 60.0
+        self._schema_watcher: Optional[threading.Thread] = None
+        self._schema_watch_db = None
+        self.query_cache_size = query_cache_size
+        self.query_cache_ttl = query_cache_ttl
+        self._query_cache: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._collections: Dict[str, Collection] = {}
+        self._query_executor: Optional[ThreadPoolExecutor] = None
+        self._query_executor_lock = threading.Lock()
 
     def connect(self, 
                 connection_string: str = None, 
@@ -40,7 +509,9 @@ class MongoDBManager:
                 username: str = None, 
                 password: str = None,
                 connect_timeout_ms: int = None,
-                socket_timeout_ms: int = None) -> bool:
+                socket_timeout_ms: int = None,
+                max_pool_size: int = None,
+                min_pool_size: int = None) -> bool:
         """
         Connect to MongoDB database.
         
@@ -53,71 +524,123 @@ class MongoDBManager:
             password (str, optional): Database password
             connect_timeout_ms (int, optional): Connection timeout in milliseconds
             socket_timeout_ms (int, optional): Socket timeout in milliseconds
+            max_pool_size (int, optional): Maximum number of pooled connections
+            min_pool_size (int, optional): Number of pooled connections kept open
             
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
+            self._apply_overrides(
+                connectTimeoutMS=connect_timeout_ms,
+                socketTimeoutMS=socket_timeout_ms,
+                maxPoolSize=max_pool_size,
+                minPoolSize=min_pool_size,
+            )
+            
             # If connection string is provided, use it directly
-
             if connection_string:
-                if connect_timeout_ms:
-                    self.connection_params["connectTimeoutMS"] = connect_timeout_ms
-                if socket_timeout_ms:
-                    self.connection_params["socketTimeoutMS"] = socket_timeout_ms
-                
-                self.client = pymongo.MongoClient(connection_string, **self.connection_params)
+                self.client = self._get_client(connection_string)
 
-                # Extract database name from connection string if not provided separately
-                if not db_name and "/" in connection_string:
-                    parts = connection_string.split("/")
-                    if len(parts) > 3:  # Format: mongodb://host:port/dbname
-                        extracted_db_name = parts[3].split("?")[0]  # Remove query parameters if present
-                        db_name = extracted_db_name
+                # Extract database name from connection string if not provided separately.
+                # Format: mongodb[+srv]://[user:pass@]host[:port][,host...]/dbname[?options]
+                if not db_name:
+                    db_name = unquote(urlsplit(connection_string).path.lstrip("/")) or None
 
             else:
-                # Update connection parameters if provided
-                if host:
-                    self.connection_params["host"] = host
-                if port:
-                    self.connection_params["port"] = port
-                if username:
-                    self.connection_params["username"] = username
-                if password:
-                    self.connection_params["password"] = password
-                if connect_timeout_ms:
-                    self.connection_params["connectTimeoutMS"] = connect_timeout_ms
-                if socket_timeout_ms:
-                    self.connection_params["socketTimeoutMS"] = socket_timeout_ms
-                
-                self.client = pymongo.MongoClient(**self.connection_params)
-                self.logger.add_log(f"LLL {self.client}")
+                # The URI carries its own address and credentials, so these only apply here
+                self._apply_overrides(host=host, port=port, username=username, password=password)
+                self.client = self._get_client()
 
-            # Test connection with a ping command
+            # Test connection with a ping command; this also starts the driver
+            # filling the pool up to minPoolSize in the background
             self.client.admin.command('ping')
             
             # Set the database
             if db_name:
                 self.db = self.client[db_name]
+                self._collections = {}
+                self.invalidate_collection_info()
+                self.invalidate_query_cache()
                 self.logger.add_log(f"Database selected: {db_name}")
             
             self.logger.add_log(f"MongoDB  connection successful -")
             return True
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"MongoDB connection failed: {error_msg}")
             return False
     
+    def _apply_overrides(self, **overrides: Any) -> None:
+        """
+        Copy the connection options passed to connect() into connection_params.
+        
+        Args:
+            **overrides: MongoClient option names mapped to values; None leaves the option unchanged
+        """
+        for option, value in overrides.items():
+            if value is not None:
+                self.connection_params[option] = value
+    
+    def _get_client(self, connection_string: str = None) -> pymongo.MongoClient:
+        """
+        Return the shared MongoClient for this configuration, creating it on first use.
+        
+        Args:
+            connection_string (str, optional): MongoDB connection string URI
+            
+        Returns:
+            pymongo.MongoClient: Cached client for the connection target and options
+        """
+        options = dict(self.connection_params)
+        # Compress wire traffic unless the caller or the URI already chose compressors
+        if ("compressors" not in options and _DEFAULT_COMPRESSORS
+                and "compressors=" not in (connection_string or "").lower()):
+            options["compressors"] = _DEFAULT_COMPRESSORS
+        
+        key = _client_key(connection_string, options)
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                if connection_string:
+                    client = pymongo.MongoClient(connection_string, **options)
+                else:
+                    client = pymongo.MongoClient(**options)
+                _CLIENT_CACHE[key] = client
+            else:
+                self.logger.add_log("Reusing cached MongoDB client")
+            return client
+    
     def disconnect(self) -> None:
-        """Close the MongoDB connection if it exists."""
-        if self.client:
-            self.client.close()
-            self.logger.add_log("MongoDB connection closed")
+        """
+        Release this manager's MongoDB connection.
+        
+        The underlying client stays open in the shared cache for other managers;
+        use close_all() to shut every cached client down.
+        """
+        if self.client is not None:
+            self.logger.add_log("MongoDB connection released")
             self.client = None
             self.db = None
+            self._collections = {}
+            self.invalidate_collection_info()
+            self.invalidate_query_cache()
+        with self._query_executor_lock:
+            executor, self._query_executor = self._query_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every cached MongoClient, e.g. on process shutdown."""
+        with _CLIENT_CACHE_LOCK:
+            clients = list(_CLIENT_CACHE.values())
+            _CLIENT_CACHE.clear()
+        for client in clients:
+            client.close()
     
-    def execute_query(self, raw_command: Union[str, Dict[str, Any]]) -> Any:
+    def execute_query(self, raw_command: Union[str, Dict[str, Any]], stream: bool = False) -> Any:
         """
         Executes a dynamic MongoDB command or query string for READ-ONLY operations.
         
@@ -130,6 +653,8 @@ class MongoDBManager:
                 - MongoDB shell syntax like 'db.users.find()'
                 - Dict for commands like {'find': 'users', 'filter': {...}}
                 - Advanced MongoDB queries with various formats
+            stream (bool, optional): For find and aggregate, return a generator
+                that yields documents one at a time instead of a list
 
         Returns:
             Any: Query results or metadata depending on the command.
@@ -139,364 +664,576 @@ class MongoDBManager:
             return None
 
         try:
-            # Define safe operations
-            SAFE_STRING_COMMANDS = {
-                "show collections",
-                "show dbs", 
-                "show databases",
-                "db stats", 
-                "db.stats()",
-                "show profile",
-                "db.getProfilingStatus()",
-                "db.version()"
-            }
+            # A recent identical read can be answered from the cache when it is enabled
+            key = None
+            if not stream and self.query_cache_size > 0 and self._is_cacheable_query(raw_command):
+                key = self._query_cache_key(raw_command)
+                found, cached = self._query_cache_get(key)
+                if found:
+                    return cached
             
-            SAFE_DICT_OPERATIONS = {
-                # Read-only collection operations
-                "find", "count", "distinct", "aggregate", "findOne", "countDocuments", "estimatedDocumentCount",
-                # Read-only database commands
-                "listCollections", "dbstats", "collstats", "dataSize", "dbStats", "ping", "hostInfo", "serverInfo",
-                "listIndexes", "getParameter", "buildInfo", "connectionStatus", "serverStatus", "validate", "profile"
-            }
+            # Handle string-based commands
+            if isinstance(raw_command, str):
+                result = self._execute_string_command(raw_command, stream)
+
+            # Handle dict-based commands
+            elif isinstance(raw_command, dict):
+                result = self._materialize(self._execute_dict_command(raw_command), stream)
+
+            else:
+                self.logger.add_log("❌ Invalid command format: %s", raw_command)
+                return {"error": "Invalid command format"}
             
-            # Check for unsafe keywords that might be part of a query
-            def contains_unsafe_operations(cmd_str: str) -> bool:
-                UNSAFE_PATTERNS = [
-                    r"\binsert\b", r"\bupdate\b", r"\bdelete\b", r"\bremove\b", 
-                    r"\bdrop\b", r"\bcreate\b", r"\breplace\b", r"\brename\b",
-                    r"\$out\b", r"\$merge\b", r"\bmapreduce\b", 
-                    r"\bcreateindex\b", r"\bdropindex\b", r"\bcreatecollection\b", r"\brenameCollection\b"
-                ]
-                cmd_lower = cmd_str.lower()
-                # Special case for operators like $dateToString that contain "safe" words as substrings
-                SAFE_OPERATORS = [
-                    "$dateToString", "$dateFromString", "$dateToparts", "$createDate"
-                ]
-                
-                # Check if any of the safe operators are in the command
-                for safe_op in SAFE_OPERATORS:
-                    if safe_op.lower() in cmd_lower:
-                        # Remove these safe operators from the string before checking for unsafe patterns
-                        cmd_lower = cmd_lower.replace(safe_op.lower(), "")
-                        
-                # Check for unsafe patterns
-                return any(re.search(pattern, cmd_lower) for pattern in UNSAFE_PATTERNS)
+            # Refusals and errors are not cached, so a retry runs again
+            if key is not None and result is not None and not (isinstance(result, dict) and "error" in result):
+                self._query_cache_put(key, result)
+            return result
+
+        except Exception as e:
+            self.logger.add_log(f"❌ Query execution error: {str(e)}")
+            return {"error": f"Query execution error: {str(e)}"}
+    
+    async def execute_query_async(self, raw_command: Union[str, Dict[str, Any]]) -> Any:
+        """
+        Run execute_query on the manager's query threads without blocking the event loop.
+        
+        The pool is bounded (QUERY_THREADS), so a burst of requests queues
+        here instead of tying up every default executor thread.
+        
+        Args:
+            raw_command (str | dict): The read-only command/query to execute
             
-            # Parse MongoDB shell syntax more robustly
-            def parse_shell_command(cmd: str):
-                # Extract collection and operation parts
-                if not cmd.startswith("db."):
-                    return None, None, None, None
-                
-                parts = cmd.split(".", 2)
-                if len(parts) < 3:
-                    return None, None, None, None
-                
-                collection_name = parts[1]
-                operation_part = parts[2]
-                
-                # Handle cases like db.collection.find({...}).sort({...}).limit(10)
-                op_chain = []
-                current_op = ""
-                depth = 0
-                param_start = -1
-                
-                for i, char in enumerate(operation_part):
-                    if char == '(' and depth == 0:
-                        # Start of parameters
-                        op_name = current_op.strip()
-                        param_start = i + 1
-                        depth += 1
-                        current_op = ""
-                    elif char == '(' and depth > 0:
-                        depth += 1
-                    elif char == ')' and depth > 0:
-                        depth -= 1
-                        if depth == 0:
-                            # End of parameters
-                            params = operation_part[param_start:i].strip()
-                            op_chain.append((op_name, params))
-                    elif char == '.' and depth == 0:
-                        # Next operation in chain
-                        current_op = ""
-                    elif depth == 0:
-                        current_op += char
-                
-                if not op_chain:
-                    return None, None, None, None
-                
-                primary_op, primary_params = op_chain[0]
-                chained_ops = op_chain[1:] if len(op_chain) > 1 else []
-                
-                return collection_name, primary_op, primary_params, chained_ops
+        Returns:
+            Any: Query results or metadata depending on the command.
+        """
+        executor = self._query_executor
+        if executor is None:
+            with self._query_executor_lock:
+                if self._query_executor is None:
+                    self._query_executor = ThreadPoolExecutor(
+                        max_workers=QUERY_THREADS, thread_name_prefix="mongo-query"
+                    )
+                executor = self._query_executor
+        return await asyncio.get_running_loop().run_in_executor(executor, self.execute_query, raw_command)
+    
+    def _coll(self, name: str) -> Collection:
+        """
+        Return the Collection object for name, reusing it across calls.
+        
+        Collection objects are cheap but not free to build (options are
+        merged each time), and queries keep hitting the same few collections.
+        
+        Args:
+            name (str): Collection name
+            
+        Returns:
+            Collection: Collection of the selected database
+        """
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = self.db[name]
+        return collection
+    
+    def _query_cache_key(self, raw_command: Union[str, Dict[str, Any]]) -> bytes:
+        """
+        Hash a command and the selected database into a compact cache key.
+        
+        Dict commands are serialized in their own key order, since the order
+        of keys in a sort specification changes the result.
+        
+        Args:
+            raw_command (str | dict): Command passed to execute_query
+            
+        Returns:
+            bytes: Digest identifying the query
+        """
+        if isinstance(raw_command, str):
+            text = raw_command.strip()
+        else:
+            text = json_util.dumps(raw_command)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.db.name, text):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+    
+    def _is_cacheable_query(self, raw_command: Union[str, Dict[str, Any]]) -> bool:
+        """
+        Tell whether a command is a find, aggregate, count or distinct whose result may be cached.
+        
+        Args:
+            raw_command (str | dict): Command passed to execute_query
+            
+        Returns:
+            bool: True if the command's operation is in _CACHEABLE_OPERATIONS
+        """
+        if isinstance(raw_command, str):
+            operation = _parse_shell_command(raw_command.strip())[1]
+        elif isinstance(raw_command, dict):
+            operation = next((op for op, _ in self._DICT_DISPATCH if op in raw_command), None)
+        else:
+            return False
+        return operation in _CACHEABLE_OPERATIONS
+    
+    def _query_cache_get(self, key: bytes) -> Tuple[bool, Any]:
+        """Return (True, result) for a fresh cached query and mark it as recently used."""
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return False, None
+            if time.monotonic() - entry[0] >= self.query_cache_ttl:
+                del self._query_cache[key]
+                return False, None
+            self._query_cache.move_to_end(key)
+        # Each hit unpickles its own copy, so callers may modify what they get
+        return True, pickle.loads(entry[1])
+    
+    def _query_cache_put(self, key: bytes, result: Any) -> None:
+        """Store a pickled query result, evicting the least recently used one when full."""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), payload)
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+    
+    def invalidate_query_cache(self) -> None:
+        """Forget every cached query result."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+    
+    def _execute_string_command(self, raw_command: str, stream: bool = False) -> Any:
+        """
+        Run a string command: a known shell helper or db.collection.method() syntax.
+        
+        Args:
+            raw_command (str): Command string
+            stream (bool, optional): Return cursor results as a generator
+            
+        Returns:
+            Any: Query results, or an error dictionary
+        """
+        cmd = raw_command.strip()
+        
+        # Block potentially unsafe string commands
+        if _contains_unsafe_operations(cmd):
+            self.logger.add_log("❌ Blocked unsafe operation in command: %s", raw_command)
+            return {"error": "Operation blocked - only read operations are permitted"}
+            
+        # Process safe standard string commands
+        string_handler = _STRING_DISPATCH.get(cmd.lower())
+        if string_handler is not None:
+            return string_handler(self)
+        
+        # Handle MongoDB shell syntax (db.collection.method())
+        if cmd.startswith("db."):
+            # Parse the command to extract collection and operation
+            collection_name, primary_op, primary_params, chained_ops = _parse_shell_command(cmd)
+            
+            if not collection_name or not primary_op:
+                self.logger.add_log("❌ Could not parse MongoDB shell command: %s", cmd)
+                return {"error": "Invalid MongoDB shell command format"}
+            
+            # Process the primary operation
+            shell_handler = self._SHELL_DISPATCH.get(primary_op)
+            if shell_handler is not None:
+                try:
+                    return self._materialize(
+                        shell_handler(self, collection_name, primary_params, chained_ops), stream
+                    )
+                except Exception as e:
+                    self.logger.add_log(f"❌ Error executing MongoDB shell command: {str(e)}")
+                    return {"error": f"Error executing command: {str(e)}"}
+        
+        # Command not recognized
+        self.logger.add_log("❌ Unsupported or potentially unsafe string command: %s", raw_command)
+        return {"error": "Command not supported in read-only mode"}
+    
+    def _execute_dict_command(self, raw_command: Dict[str, Any]) -> Any:
+        """
+        Run a dictionary command such as {'find': 'users', 'filter': {...}}.
+        
+        Args:
+            raw_command (dict): Command document
+            
+        Returns:
+            Any: Query results, or an error dictionary
+        """
+        # Check keys and string values for unsafe operations
+        if _document_has_unsafe_operations(raw_command):
+            self.logger.add_log("❌ Blocked unsafe operation in command: %s", raw_command)
+            return {"error": "Operation blocked - only read operations are permitted"}
+        
+        # The first recognised operation key wins, in the same priority order as before
+        for operation, handler in self._DICT_DISPATCH:
+            if operation in raw_command:
+                return handler(self, raw_command[operation], raw_command)
+        
+        # For other dict commands, only allow specifically whitelisted operations
+        operation = next(iter(raw_command), None)
+        if operation in _METADATA_COMMANDS and len(raw_command) == 1:
+            return self._meta_command(operation, raw_command[operation])
+        if operation in SAFE_DICT_OPERATIONS:
+            # Run only whitelisted commands
+            return self.db.command(raw_command)
+        
+        self.logger.add_log("❌ Blocked non-whitelisted operation: %s", operation)
+        return {"error": f"Operation '{operation}' not permitted in read-only mode"}
+    
+    def _meta_command(self, command: str, value: Any) -> Any:
+        """
+        Run a metadata command, reusing its reply for up to _meta_ttl seconds.
+        
+        Introspection tools ask for the same collection stats, indexes and build info
+        over and over, in both shell and dict syntax; this shares one round
+        trip between them. DDL events, reconnects and refreshes clear the cache
+        through invalidate_collection_info.
+        
+        Args:
+            command (str): Command name, e.g. 'collstats' or 'buildInfo'
+            value (Any): Command argument, usually a collection name
+            
+        Returns:
+            Any: Copy of the command reply
+        """
+        key = (command, str(value))
+        now = time.monotonic()
+        cached = self._meta_cache.get(key)
+        if cached is None or now - cached[0] > self._meta_ttl:
+            cached = self._meta_cache[key] = (now, self.db.command(command, value))
+        return copy.deepcopy(cached[1])
+    
+    def _materialize(self, result: Any, stream: bool = False) -> Any:
+        """
+        Turn a cursor returned by a handler into JSON-compatible results.
+        
+        Args:
+            result: Handler result; cursors are drained, anything else is returned as is
+            stream (bool, optional): Yield documents lazily instead of building a list
+            
+        Returns:
+            Any: List of documents, a generator of documents, or the original result
+        """
+        if not isinstance(result, (Cursor, CommandCursor)):
+            return result
+        
+        cursor = result.batch_size(RESULT_BATCH_SIZE)
+        if stream:
+            return (_to_jsonable(doc) for doc in cursor)
+        
+        # Convert each batch as it arrives, so the raw documents can be freed
+        # instead of keeping a raw and a converted copy of the whole result
+        docs = [_to_jsonable(doc) for doc in cursor]
+        if len(docs) == self.default_find_limit:
+            self.logger.add_log(f"⚠️ Result reached the {self.default_find_limit} document limit and may be truncated")
+        return docs
+    
+    def _bound_pipeline(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cap an aggregation's output at the default find limit.
+        
+        A pipeline that already ends in $limit or $count is left alone; any
+        other pipeline, $group included, can emit one document per input.
+        
+        Args:
+            pipeline (list): Aggregation pipeline
+            
+        Returns:
+            list: Pipeline whose result size is bounded
+        """
+        if pipeline and (_is_stage(pipeline[-1], "$limit") or _is_stage(pipeline[-1], "$count")):
+            return pipeline
+        return [*pipeline, {"$limit": self.default_find_limit}]
+    
+    def _reorder_pipeline(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Move $match stages ahead of any $sort stages directly before them.
+        
+        Filtering first means fewer documents are sorted, and the result is
+        the same because $sort neither adds, removes nor changes documents.
+        Other stages are left in place, since moving a $match across them
+        can change what it sees.
+        
+        Args:
+            pipeline (list): Aggregation pipeline
+            
+        Returns:
+            list: Pipeline with the same results, filtering as early as is safe
+        """
+        reordered = list(pipeline)
+        moved = False
+        for i in range(1, len(reordered)):
+            j = i
+            while j > 0 and _is_stage(reordered[j], "$match") and _is_stage(reordered[j - 1], "$sort"):
+                reordered[j - 1], reordered[j] = reordered[j], reordered[j - 1]
+                j -= 1
+                moved = True
+        
+        if moved:
+            self.logger.add_log("Moved $match ahead of $sort in aggregation pipeline")
+        return reordered
+    
+    def _eval_params(self, params_str: str):
+        """
+        Parse shell parameters as Extended JSON.
+        
+        {"$oid": ...} and {"$date": ...} become ObjectId and datetime values.
+        Shell syntax (unquoted keys, ObjectId(...), ISODate(...)) is rewritten
+        and parsed once more only if the text isn't valid JSON.
+        
+        Args:
+            params_str (str): Parameter text between the call parentheses
+            
+        Returns:
+            Parsed parameters
+            
+        Raises:
+            ValueError: If the parameters cannot be parsed
+        """
+        if not params_str.strip():
+            return {}
+        
+        try:
+            return json_util.loads(params_str)
+        except ValueError:
+            pass
+        try:
+            return json_util.loads(_shell_to_extended_json(params_str))
+        except ValueError:
+            self.logger.add_log("❌ Failed to parse parameters: %s", params_str)
+            raise ValueError(f"Could not parse query parameters: {params_str}")
+    
+    def _count(self, collection, filter_dict: Optional[Dict[str, Any]]) -> int:
+        """
+        Count documents, using collection metadata when there is no filter.
+        
+        count_documents({}) scans the whole collection, while
+        estimated_document_count() reads the cached count.
+        
+        Args:
+            collection: pymongo Collection to count
+            filter_dict (dict, optional): Query filter
+            
+        Returns:
+            int: Number of matching documents
+        """
+        if not filter_dict:
+            return collection.estimated_document_count()
+        return collection.count_documents(filter_dict)
+    
+    def _aggregate(self, collection, pipeline: List[Dict[str, Any]], max_time_ms: int) -> Any:
+        """
+        Run a read-only aggregation with the manager's default bounds.
+        
+        Args:
+            collection: pymongo Collection to aggregate
+            pipeline (list): Checked aggregation pipeline
+            max_time_ms (int): Server-side time limit in milliseconds
+            
+        Returns:
+            Any: Command cursor
+        """
+        pipeline = self._bound_pipeline(self._reorder_pipeline(pipeline))
+        return collection.aggregate(pipeline, batchSize=RESULT_BATCH_SIZE, maxTimeMS=max_time_ms)
+    
+    # Shell syntax handlers: (collection_name, primary_params, chained_ops) -> result
+    
+    def _shell_find_one(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.findOne(filter)."""
+        filter_dict = {} if not params.strip() else self._eval_params(params)
+        result = self._coll(collection_name).find_one(filter_dict)
+        return _to_jsonable(result) if result else None
+    
+    def _shell_find(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.find(filter) with sort/limit/skip/projection/count chains."""
+        collection = self._coll(collection_name)
+        filter_dict = {} if not params.strip() else self._eval_params(params)
+        # Bound runaway queries on the server; a chained .limit() replaces the default
+        cursor = collection.find(filter_dict).limit(self.default_find_limit).max_time_ms(self.default_max_time_ms)
+        
+        # Process chained operations (sort, limit, skip, etc.)
+        for op_name, op_params in chained_ops:
+            if op_name == "count":
+                return self._count(collection, filter_dict)
+            elif op_name == "sort":
+                sort_params = self._eval_params(op_params)
+                cursor = cursor.sort(list(sort_params.items()))
+            elif op_name == "limit":
+                cursor = cursor.limit(int(op_params.strip()))
+            elif op_name == "skip":
+                cursor = cursor.skip(int(op_params.strip()))
+            elif op_name == "project" or op_name == "projection":
+                proj_params = self._eval_params(op_params)
+                cursor = cursor.projection(proj_params)
+        
+        # If no chained operations consumed the result, hand the cursor back for materializing
+        return cursor
+    
+    def _shell_aggregate(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.aggregate(pipeline), rejecting write stages."""
+        pipeline = self._eval_params(params) if params.strip() else []
+        
+        # Ensure the pipeline doesn't contain $out or $merge
+        unsafe_stage = _find_unsafe_stage(pipeline)
+        if unsafe_stage is not None:
+            self.logger.add_log(f"❌ Blocked unsafe aggregation stage in: {collection_name}.aggregate")
+            return {"error": "Unsafe aggregation stage detected"}
+        
+        return self._aggregate(self._coll(collection_name), pipeline, self.default_max_time_ms)
+    
+    def _shell_count(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.count(filter) and countDocuments(filter)."""
+        filter_dict = {} if not params.strip() else self._eval_params(params)
+        return self._count(self._coll(collection_name), filter_dict)
+    
+    def _shell_estimated_count(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.estimatedDocumentCount()."""
+        return self._coll(collection_name).estimated_document_count()
+    
+    def _shell_distinct(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.distinct(key, filter)."""
+        # Split params on the commas outside of brackets, objects and strings
+        args = _split_top_level_args(params)
+        
+        if not args:
+            return {"error": "distinct requires a field name"}
+        
+        key = args[0].strip().strip('"\'')
+        filter_dict = {} if len(args) < 2 else self._eval_params(args[1])
+        result = self._coll(collection_name).distinct(key, filter_dict)
+        return _to_jsonable(result) if result else []
+    
+    def _shell_stats(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.stats()."""
+        return self._meta_command("collstats", collection_name)
+    
+    def _shell_explain(self, collection_name: str, params: str, chained_ops: tuple) -> Any:
+        """Handle db.collection.explain(filter)."""
+        explain_params = self._eval_params(params)
+        return self._coll(collection_name).find(explain_params).explain()
+    
+    _SHELL_DISPATCH = {
+        "findOne": _shell_find_one,
+        "find": _shell_find,
+        "aggregate": _shell_aggregate,
+        "count": _shell_count,
+        "countDocuments": _shell_count,
+        "estimatedDocumentCount": _shell_estimated_count,
+        "distinct": _shell_distinct,
+        "stats": _shell_stats,
+        "explain": _shell_explain,
+    }
+    
+    # Dict command handlers: (collection_name, command) -> result
+    
+    def _dict_find(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'find': collection, 'filter': ..., 'sort': ..., 'limit': ...}."""
+        # Same server-side bounds as shell-style find(); explicit values replace them
+        return self._run_find(
+            coll_name,
+            command.get("filter", {}),
+            command.get("projection"),
+            sort=command.get("sort"),
+            limit=command.get("limit") or self.default_find_limit,
+            skip=command.get("skip"),
+            hint=command.get("hint"),
+            timeout_ms=command.get("maxTimeMS") or self.default_max_time_ms,
+        )
+    
+    def _run_find(
+        self,
+        collection: str,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[Union[Dict[str, int], List[tuple]]] = None,
+        limit: Optional[int] = None,
+        skip: Optional[int] = None,
+        hint: Optional[Any] = None,
+        timeout_ms: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> Cursor:
+        """
+        Open a find cursor with every option passed to a single find() call.
+        
+        Shared by dict find commands and execute_query_to_dataframe, so both
+        push the same projection, sort and bounds down to the server instead
+        of chaining cursor modifiers.
+        
+        Args:
+            collection (str): Collection name
+            query (Dict[str, Any], optional): Query filter
+            projection (Dict[str, Any], optional): Fields to include/exclude
+            sort (Union[Dict[str, int], List[tuple]], optional): Sort specification
+            limit (int, optional): Maximum number of documents; falsy means no limit
+            skip (int, optional): Number of documents to skip
+            hint (optional): Index to use
+            timeout_ms (int, optional): Operation timeout in milliseconds
+            batch_size (int, optional): Documents per round trip
             
-            # Parse and evaluate JSON-like parameters safely
-            def safe_eval_params(params_str: str):
-                if not params_str.strip():
-                    return {}
-                    
-                # Try to handle various parameter formats
-                try:
-                    # First attempt direct JSON parsing
-                    return json.loads(params_str)
-                except json.JSONDecodeError:
-                    try:
-                        # Handle JavaScript style parameters (unquoted keys)
-                        # Convert to proper JSON format by quoting keys
-                        fixed_params = re.sub(r'(\w+)(?=\s*:)', r'"\1"', params_str)
-                        return json.loads(fixed_params)
-                    except (json.JSONDecodeError, re.error):
-                        try:
-                            # Handle ObjectId references
-                            if "ObjectId" in params_str:
-                                # Replace ObjectId syntax with proper format
-                                params_str = re.sub(r'ObjectId\(["\'](.+?)["\']\)', r'{"$oid": "\1"}', params_str)
-                                return json.loads(params_str)
-                        except (json.JSONDecodeError, re.error):
-                            self.logger.add_log(f"❌ Failed to parse parameters: {params_str}")
-                            raise ValueError(f"Could not parse query parameters: {params_str}")
-                    
-            # Handle string-based commands
-            if isinstance(raw_command, str):
-                cmd = raw_command.strip()
-                cmd_lower = cmd.lower()
-                
-                # Block potentially unsafe string commands
-                if contains_unsafe_operations(cmd_lower):
-                    self.logger.add_log(f"❌ Blocked unsafe operation in command: {raw_command}")
-                    return {"error": "Operation blocked - only read operations are permitted"}
-                    
-                # Process safe standard string commands
-                if cmd_lower in SAFE_STRING_COMMANDS:
-                    if cmd_lower == "show collections":
-                        result = self.db.list_collection_names()
-                        return result
-                    elif cmd_lower in ("show dbs", "show databases"):
-                        result = self.client.list_database_names()
-                        return result
-                    elif cmd_lower in ("db stats", "db.stats()"):
-                        return self.db.command("dbstats")
-                    elif cmd_lower == "show profile":
-                        return self.db.command("profile", -1)
-                    elif cmd_lower == "db.getProfilingStatus()":
-                        return self.db.command("profile", -1)
-                    elif cmd_lower == "db.version()":
-                        return self.db.command("buildInfo").get("version")
-                
-                # Handle MongoDB shell syntax (db.collection.method())
-                elif cmd.startswith("db."):
-                    # Parse the command to extract collection and operation
-                    collection_name, primary_op, primary_params, chained_ops = parse_shell_command(cmd)
-                    
-                    if collection_name == "getCollectionNames()":
-                        return self.db.list_collection_names()
-                    
-                    if not collection_name or not primary_op:
-                        self.logger.add_log(f"❌ Could not parse MongoDB shell command: {cmd}")
-                        return {"error": "Invalid MongoDB shell command format"}
-                    
-                    # Process the primary operation
-                    try:
-                        collection = self.db[collection_name]
-                        
-                        # Handle findOne()
-                        if primary_op == "findOne":
-                            filter_dict = {} if not primary_params.strip() else safe_eval_params(primary_params)
-                            result = collection.find_one(filter_dict)
-                            return json.loads(json_util.dumps(result)) if result else None
-                        
-                        # Handle find() and variations
-                        elif primary_op == "find":
-                            filter_dict = {} if not primary_params.strip() else safe_eval_params(primary_params)
-                            cursor = collection.find(filter_dict)
-                            
-                            # Process chained operations (sort, limit, skip, etc.)
-                            for op_name, op_params in chained_ops:
-                                if op_name == "count":
-                                    return collection.count_documents(filter_dict)
-                                elif op_name == "sort":
-                                    sort_params = safe_eval_params(op_params)
-                                    cursor = cursor.sort(list(sort_params.items()))
-                                elif op_name == "limit":
-                                    limit_val = int(op_params.strip())
-                                    cursor = cursor.limit(limit_val)
-                                elif op_name == "skip":
-                                    skip_val = int(op_params.strip())
-                                    cursor = cursor.skip(skip_val)
-                                elif op_name == "project" or op_name == "projection":
-                                    proj_params = safe_eval_params(op_params)
-                                    cursor = cursor.projection(proj_params)
-                            
-                            # If no chained operations consumed the result, return the cursor as a list
-                            result = list(cursor)
-                            return json.loads(json_util.dumps(result)) if result else []
-                        
-                        # Handle aggregate()
-                        elif primary_op == "aggregate":
-                            pipeline = safe_eval_params(primary_params) if primary_params.strip() else []
-                            
-                            # Ensure the pipeline doesn't contain $out or $merge
-                            for stage in pipeline:
-                                if "$out" in stage or "$merge" in stage:
-                                    self.logger.add_log(f"❌ Blocked unsafe aggregation stage in: {raw_command}")
-                                    return {"error": "Unsafe aggregation stage detected"}
-                            
-                            result = list(collection.aggregate(pipeline))
-                            return json.loads(json_util.dumps(result)) if result else []
-                        
-                        # Handle count() and countDocuments()
-                        elif primary_op in ("count", "countDocuments"):
-                            filter_dict = {} if not primary_params.strip() else safe_eval_params(primary_params)
-                            return collection.count_documents(filter_dict)
-                        
-                        # Handle estimatedDocumentCount()
-                        elif primary_op == "estimatedDocumentCount":
-                            return collection.estimated_document_count()
-                        
-                        # Handle distinct()
-                        elif primary_op == "distinct":
-                            # Split params by the first comma outside of brackets/objects
-                            params = []
-                            current_param = ""
-                            depth = 0
-                            
-                            for char in primary_params:
-                                if char in "{[":
-                                    depth += 1
-                                    current_param += char
-                                elif char in "}]":
-                                    depth -= 1
-                                    current_param += char
-                                elif char == ',' and depth == 0:
-                                    params.append(current_param.strip())
-                                    current_param = ""
-                                else:
-                                    current_param += char
-                            
-                            if current_param:
-                                params.append(current_param.strip())
-                            
-                            if len(params) >= 1:
-                                key = params[0].strip().strip('"\'')
-                                filter_dict = {} if len(params) < 2 else safe_eval_params(params[1])
-                                result = collection.distinct(key, filter_dict)
-                                return json.loads(json_util.dumps(result)) if result else []
-                        
-                        # Handle stats()
-                        elif primary_op == "stats":
-                            return self.db.command("collstats", collection_name)
-                        
-                        # Handle explain()
-                        elif primary_op == "explain":
-                            explain_params = safe_eval_params(primary_params)
-                            return collection.find(explain_params).explain()
-                    
-                    except Exception as e:
-                        self.logger.add_log(f"❌ Error executing MongoDB shell command: {str(e)}")
-                        return {"error": f"Error executing command: {str(e)}"}
-                
-                # Command not recognized
-                self.logger.add_log(f"❌ Unsupported or potentially unsafe string command: {raw_command}")
-                return {"error": "Command not supported in read-only mode"}
-
-            # Handle dict-based commands
-            elif isinstance(raw_command, dict):
-                # Convert to string to check for unsafe operations
-                cmd_str = json.dumps(raw_command)
-                if contains_unsafe_operations(cmd_str):
-                    self.logger.add_log(f"❌ Blocked unsafe operation in command: {raw_command}")
-                    return {"error": "Operation blocked - only read operations are permitted"}
-                
-                # Handle find operation explicitly (most common read operation)
-                if "find" in raw_command:
-                    coll_name = raw_command["find"]
-                    filter_ = raw_command.get("filter", {})
-                    projection = raw_command.get("projection")
-                    sort = raw_command.get("sort")
-                    limit = raw_command.get("limit")
-                    skip = raw_command.get("skip")
-                    hint = raw_command.get("hint")
-                    max_time_ms = raw_command.get("maxTimeMS")
-
-                    cursor = self.db[coll_name].find(filter_, projection or {})
-                    if sort:
-                        cursor = cursor.sort(list(sort.items()) if isinstance(sort, dict) else sort)
-                    if limit:
-                        cursor = cursor.limit(limit)
-                    if skip:
-                        cursor = cursor.skip(skip)
-                    if hint:
-                        cursor = cursor.hint(hint)
-                    if max_time_ms:
-                        cursor = cursor.max_time_ms(max_time_ms)
-
-                    result = list(cursor)
-                    return json.loads(json_util.dumps(result)) if result else []
-                
-                # Handle findOne operation
-                elif "findOne" in raw_command:
-                    coll_name = raw_command["findOne"]
-                    filter_ = raw_command.get("filter", {})
-                    projection = raw_command.get("projection")
-                    
-                    result = self.db[coll_name].find_one(filter_, projection or {})
-                    return json.loads(json_util.dumps(result)) if result else None
-                
-                # Handle other collection operations
-                elif any(op in raw_command for op in ["count", "countDocuments", "distinct", "aggregate"]):
-                    op = next(op for op in ["count", "countDocuments", "distinct", "aggregate"] if op in raw_command)
-                    coll_name = raw_command[op]
-                    
-                    if op in ["count", "countDocuments"]:
-                        filter_ = raw_command.get("filter", {})
-                        return self.db[coll_name].count_documents(filter_)
-                    
-                    elif op == "distinct":
-                        key = raw_command.get("key")
-                        filter_ = raw_command.get("filter", {})
-                        if not key:
-                            return {"error": "distinct operation requires a 'key' parameter"}
-                        result = self.db[coll_name].distinct(key, filter_)
-                        return json.loads(json_util.dumps(result)) if result else []
-                    
-                    elif op == "aggregate":
-                        pipeline = raw_command.get("pipeline", [])
-                        # Check for unsafe aggregation stages
-                        for stage in pipeline:
-                            if any(unsafe_stage in stage for unsafe_stage in ["$out", "$merge"]):
-                                self.logger.add_log(f"❌ Blocked unsafe aggregation stage: {stage}")
-                                return {"error": "Unsafe aggregation stage detected"}
-                        
-                        result = list(self.db[coll_name].aggregate(pipeline))
-                        return json.loads(json_util.dumps(result)) if result else []
-                
-                # For database and collection information commands
-                elif "listCollections" in raw_command:
-                    filter_ = raw_command.get("filter", {})
-                    return list(self.db.list_collections(filter_))
-                
-                elif "collStats" in raw_command or "collstats" in raw_command:
-                    coll_name = raw_command.get("collStats") or raw_command.get("collstats")
-                    return self.db.command("collstats", coll_name)
-                
-                # For other dict commands, only allow specifically whitelisted operations
-                else:
-                    # Extract operation name (first key in dict)
-                    operation = next(iter(raw_command), None)
-                    if operation in SAFE_DICT_OPERATIONS:
-                        # Run only whitelisted commands
-                        return self.db.command(raw_command)
-                    else:
-                        self.logger.add_log(f"❌ Blocked non-whitelisted operation: {operation}")
-                        return {"error": f"Operation '{operation}' not permitted in read-only mode"}
-
-            else:
-                self.logger.add_log(f"❌ Invalid command format: {raw_command}")
-                return {"error": "Invalid command format"}
-
-        except Exception as e:
-            self.logger.add_log(f"❌ Query execution error: {str(e)}")
-            return {"error": f"Query execution error: {str(e)}"}
+        Returns:
+            Cursor: Unopened cursor over the matching documents
+        """
+        return self._coll(collection).find(
+            query or {},
+            projection or None,
+            skip=skip or 0,
+            limit=limit or 0,
+            sort=(list(sort.items()) if isinstance(sort, dict) else sort) or None,
+            max_time_ms=timeout_ms or None,
+            hint=hint or None,
+            batch_size=batch_size or 0,
+        )
+    
+    def _dict_find_one(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'findOne': collection, 'filter': ..., 'projection': ...}."""
+        result = self._coll(coll_name).find_one(command.get("filter", {}), command.get("projection") or None)
+        return _to_jsonable(result) if result else None
+    
+    def _dict_count(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'count': collection} and {'countDocuments': collection}."""
+        return self._count(self._coll(coll_name), command.get("filter", {}))
+    
+    def _dict_distinct(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'distinct': collection, 'key': field, 'filter': ...}."""
+        key = command.get("key")
+        if not key:
+            return {"error": "distinct operation requires a 'key' parameter"}
+        result = self._coll(coll_name).distinct(key, command.get("filter", {}))
+        return _to_jsonable(result) if result else []
+    
+    def _dict_aggregate(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'aggregate': collection, 'pipeline': [...]}, rejecting write stages."""
+        pipeline = command.get("pipeline", [])
+        # Check for unsafe aggregation stages
+        unsafe_stage = _find_unsafe_stage(pipeline)
+        if unsafe_stage is not None:
+            self.logger.add_log("❌ Blocked unsafe aggregation stage: %s", unsafe_stage)
+            return {"error": "Unsafe aggregation stage detected"}
+        
+        return self._aggregate(
+            self._coll(coll_name), pipeline, command.get("maxTimeMS") or self.default_max_time_ms
+        )
+    
+    def _dict_list_collections(self, _: Any, command: Dict[str, Any]) -> Any:
+        """Handle {'listCollections': 1, 'filter': ...}."""
+        return list(self.db.list_collections(command.get("filter", {})))
+    
+    def _dict_coll_stats(self, coll_name: str, command: Dict[str, Any]) -> Any:
+        """Handle {'collStats': collection}."""
+        return self._meta_command("collstats", coll_name)
+    
+    # Checked in order, so a command naming several operations behaves as before
+    _DICT_DISPATCH = (
+        ("find", _dict_find),
+        ("findOne", _dict_find_one),
+        ("count", _dict_count),
+        ("countDocuments", _dict_count),
+        ("distinct", _dict_distinct),
+        ("aggregate", _dict_aggregate),
+        ("listCollections", _dict_list_collections),
+        ("collStats", _dict_coll_stats),
+        ("collstats", _dict_coll_stats),
+    )
  
     # def execute_query(self, raw_command: Union[str, Dict[str, Any]]) -> Any:
     #     """
@@ -873,11 +1610,15 @@ class MongoDBManager:
         projection: Optional[Dict[str, Any]] = None,
         sort: Optional[Union[Dict[str, int], List[tuple]]] = None,
         limit: Optional[int] = None,
-        timeout_ms: Optional[int] = None
+        timeout_ms: Optional[int] = None,
+        dtype: Optional[Any] = None
     ) -> Optional[pd.DataFrame]:
         """
         Execute a MongoDB find query and return results as DataFrame.
         
+        The projection, sort, limit and timeout are applied on the server, so
+        only the requested fields of the requested documents are transferred.
+        
         Args:
             collection (str): Collection name
             query (Dict[str, Any], optional): Query filter
@@ -885,20 +1626,66 @@ class MongoDBManager:
             sort (Union[Dict[str, int], List[tuple]], optional): Sort specification
             limit (int, optional): Number of results to return
             timeout_ms (int, optional): Operation timeout in milliseconds
+            dtype (optional): dtype applied to every column of the DataFrame
             
         Returns:
             pd.DataFrame: DataFrame containing query results or None if failed
         """
-        # return self.execute_query(
-        #     collection=collection,
-        #     operation="find",
-        #     query=query,
-        #     projection=projection,
-        #     sort=sort,
-        #     limit=limit,
-        #     timeout_ms=timeout_ms
-        # )
-        return self.execute_query(query)
+        if self.client is None or self.db is None:
+            self.logger.add_log("❌ No active MongoDB connection.")
+            return None
+        
+        try:
+            # Larger batches mean fewer getMore round trips for big result sets
+            cursor = self._run_find(
+                collection, query, projection,
+                sort=sort, limit=limit, timeout_ms=timeout_ms,
+                batch_size=max(1000, limit or 1000),
+            )
+            
+            # An inclusion projection fixes the columns up front
+            columns = None
+            if projection and all(projection.values()) and not any("." in field for field in projection):
+                columns = list(projection)
+                if "_id" not in projection:
+                    columns.insert(0, "_id")
+            
+            df = pd.DataFrame.from_records(list(cursor), columns=columns)
+            if dtype is not None and not df.empty:
+                df = df.astype(dtype)
+            
+            self.logger.add_log(f"✅ Retrieved {len(df)} documents from {collection}")
+            return df
+        
+        except Exception as e:
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
+            self.logger.add_log(f"❌ Query execution error: {error_msg}")
+            return None
+    
+    def _list_collection_names(self, ttl: float = 30.0) -> List[str]:
+        """
+        List the database's collections, reusing a recent answer.
+        
+        system.* namespaces are filtered out on the server, so schema and
+        stats probes never run against them.
+        
+        Schema, relationship and collection info lookups all need the names,
+        so within ttl seconds they share one round trip. While the schema
+        watcher runs, creates, drops and renames patch the cached list in place.
+        
+        Args:
+            ttl (float, optional): Seconds a cached listing stays valid
+            
+        Returns:
+            List[str]: Collection names; callers must not modify it
+        """
+        cached = self._collection_names_cache
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        
+        names = self.db.list_collection_names(filter=_USER_COLLECTIONS_FILTER)
+        self._collection_names_cache = (time.monotonic(), names)
+        return names
     
     def get_collection_schema(self) -> bool:
         """
@@ -915,33 +1702,13 @@ class MongoDBManager:
 
         try:
             # Get list of collections
-            collections = self.db.list_collection_names()
+            collections = self._list_collection_names()
             
-            # Get schema information for each collection
-            for collection_name in collections:
-                # Sample a few documents to infer schema
-                sample_docs = list(self.db[collection_name].find().limit(100))
-                
-                if not sample_docs:
-                    self.collection_schema[collection_name] = []
-                    continue
-                
-                # Extract field information from sample documents
-                field_info = {}
-                for doc in sample_docs:
-                    for field, value in doc.items():
-                        if field not in field_info:
-                            field_info[field] = {
-                                "name": field,
-                                "type": type(value).__name__,
-                                "nullable": True  # MongoDB fields are always nullable
-                            }
-                
-                # Convert to list format similar to the PostgreSQL version
-                self.collection_schema[collection_name] = [
-                    {"name": name, "type": info["type"], "nullable": info["nullable"]}
-                    for name, info in field_info.items()
-                ]
+            # Sample collections side by side; the client is thread-safe and pooled
+            if collections:
+                with ThreadPoolExecutor(max_workers=min(32, len(collections))) as executor:
+                    fields = executor.map(self._infer_collection_fields, collections)
+                    self.collection_schema.update(zip(collections, fields))
                 
             self.logger.add_log(f"✅ Retrieved schema for {len(collections)} collections")
             return True
@@ -950,6 +1717,79 @@ class MongoDBManager:
             self.logger.add_log(f"❌ Error retrieving collection schema: {e}")
             return False
     
+    def _infer_collection_fields(self, collection_name: str) -> List[Dict[str, Any]]:
+        """
+        Infer a collection's fields from a random sample of its documents.
+        
+        The server samples the documents and reports each field's BSON type
+        names with $type, so only one small document per field comes back
+        instead of the sampled documents themselves. If the server rejects
+        the pipeline, the sample is fetched and inspected client-side.
+        
+        Args:
+            collection_name (str): Name of the collection to sample
+            
+        Returns:
+            List of field descriptions with name, type and nullable keys
+        """
+        try:
+            field_groups = list(self._coll(collection_name).aggregate(
+                _SCHEMA_TYPES_PIPELINE,
+                maxTimeMS=5000
+            ))
+        except OperationFailure as e:
+            self.logger.add_log("Server-side schema inference failed for %s, sampling documents instead: %s", collection_name, e)
+            return self._infer_collection_fields_from_documents(collection_name)
+        
+        # _id first, then the remaining fields alphabetically for a stable order
+        field_groups.sort(key=lambda group: (group["_id"] != "_id", group["_id"]))
+        return [
+            {
+                "name": group["_id"],
+                # Several types mean the field isn't used consistently, e.g. "int|string"
+                "type": "|".join(sorted(t for t in group["types"] if t != "null")) or "null",
+                "nullable": True  # MongoDB fields are always nullable
+            }
+            for group in field_groups
+        ]
+    
+    def _infer_collection_fields_from_documents(self, collection_name: str) -> List[Dict[str, Any]]:
+        """
+        Infer a collection's fields by sampling documents and inspecting them locally.
+        
+        $sample picks documents across the whole collection, unlike
+        find().limit(), which returns the oldest documents in natural order.
+        
+        Args:
+            collection_name (str): Name of the collection to sample
+            
+        Returns:
+            List of field descriptions with name, type and nullable keys
+        """
+        sample_docs = self._coll(collection_name).aggregate(
+            [{"$sample": {"size": SCHEMA_SAMPLE_SIZE}}],
+            batchSize=SCHEMA_SAMPLE_SIZE,
+            maxTimeMS=5000
+        )
+        
+        # Record the first-seen type of each field; most documents add no new
+        # fields, and the key-view subset test skips them without a Python loop
+        field_types = {}
+        for doc in sample_docs:
+            if doc.keys() <= field_types.keys():
+                continue
+            field_types.update(
+                (field, type(value).__name__)
+                for field, value in doc.items()
+                if field not in field_types
+            )
+        
+        # Convert to list format similar to the PostgreSQL version
+        return [
+            {"name": name, "type": type_name, "nullable": True}  # MongoDB fields are always nullable
+            for name, type_name in field_types.items()
+        ]
+    
     def get_collection_relationships(self) -> Dict[str, List[Dict[str, str]]]:
         """
         Attempt to infer relationships between collections based on field naming.
@@ -965,127 +1805,146 @@ class MongoDBManager:
             return {}
             
         try:
-            relationships = {}
-            collections = self.db.list_collection_names()
-            
             # First, ensure we have schema information
             if not self.collection_schema:
                 self.get_collection_schema()
             
-            # Look for potential relationships based on field naming patterns
-            for collection_name in collections:
-                relationships[collection_name] = []
+            relationships = self._infer_relationships(self._list_collection_names())
+            
+            self.logger.add_log("Inferred collection relationships successfully")
+            return relationships
+            
+        except Exception as e:
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
+            self.logger.add_log(f"❌ Error inferring collection relationships: {error_msg}")
+            return {}
+            
+    def _infer_relationships(self, collection_names: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Infer references between collections from the already loaded schema.
+        
+        Works purely on self.collection_schema and the given names, so callers
+        that have just listed the collections don't pay for another lookup.
+        
+        Args:
+            collection_names: Collections to consider, as listed on the server
+            
+        Returns:
+            Dictionary of collection relationships
+        """
+        relationships = {}
+        collection_set = frozenset(collection_names)
+        schema = self.collection_schema
+        
+        # Look for potential relationships based on field naming patterns
+        for collection_name in collection_names:
+            relationships[collection_name] = []
+            
+            # Skip if no schema info available
+            if collection_name not in schema:
+                continue
+            
+            for field in schema[collection_name]:
+                field_name = field["name"]
                 
-                # Skip if no schema info available
-                if collection_name not in self.collection_schema:
-                    continue
+                # Common patterns for references
+                if field_name.endswith("_id") and field_name != "_id":
+                    # Extract potential referenced collection name
+                    referenced_collection = field_name[:-3]
                     
-                fields = self.collection_schema[collection_name]
-                
-                for field in fields:
-                    field_name = field["name"]
+                    # Check for plural form
+                    if referenced_collection.endswith("s"):
+                        referenced_collection_singular = referenced_collection[:-1]
+                    else:
+                        referenced_collection_singular = referenced_collection
+                        referenced_collection = referenced_collection + "s"
                     
-                    # Common patterns for references
-                    if field_name.endswith("_id") and field_name != "_id":
-                        # Extract potential referenced collection name
-                        referenced_collection = field_name[:-3]
-                        
-                        # Check for plural form
-                        if referenced_collection.endswith("s"):
-                            referenced_collection_singular = referenced_collection[:-1]
-                        else:
-                            referenced_collection_singular = referenced_collection
-                            referenced_collection = referenced_collection + "s"
+                    # Check if either form exists as a collection
+                    if referenced_collection in collection_set or referenced_collection_singular in collection_set:
+                        target_collection = referenced_collection if referenced_collection in collection_set else referenced_collection_singular
                         
-                        # Check if either form exists as a collection
-                        if referenced_collection in collections or referenced_collection_singular in collections:
-                            target_collection = referenced_collection if referenced_collection in collections else referenced_collection_singular
-                            
-                            relationships[collection_name].append({
-                                "column": field_name,
-                                "references_table": target_collection,
-                                "references_column": "_id"
-                            })
-                    
-                    # Field with the exact name of another collection
-                    elif field_name in collections:
                         relationships[collection_name].append({
                             "column": field_name,
-                            "references_table": field_name,
-                            "references_column": "unknown"
+                            "references_table": target_collection,
+                            "references_column": "_id"
                         })
                 
-            self.logger.add_log("Inferred collection relationships successfully")
-            return relationships
-            
-        except Exception as e:
-            error_msg = str(e).replace("\n", " ")
-            self.logger.add_log(f"❌ Error inferring collection relationships: {error_msg}")
-            return {}
-            
+                # Field with the exact name of another collection
+                elif field_name in collection_set:
+                    relationships[collection_name].append({
+                        "column": field_name,
+                        "references_table": field_name,
+                        "references_column": "unknown"
+                    })
+        
+        return relationships
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """
         Get enriched collection information including inferred relationships and statistics.
         
+        The result is cached for _info_ttl seconds, since collections, indexes
+        and sizes change far less often than this is called. The cache is
+        dropped by invalidate_collection_info() and, while watch_schema_changes()
+        runs, updated one collection at a time as collections change.
+        
         Returns:
-            Dictionary with comprehensive collection information
+            Dictionary with comprehensive collection information; its "summary"
+            key holds the same statistics as columns (see _collection_summary)
         """
+        cached = self._info_cache
+        if cached and time.monotonic() - cached[0] < self._info_ttl:
+            return cached[1]
+        
         self.logger.add_log("Retrieving collection information...")
         
+        db = self.db
+        if self.client is None or db is None:
+            self.logger.add_log("MongoDB not connected")
+            return {"collections": {}, "relationships": {}, "error": "MongoDB not connected"}
+        
         try:
             # First, ensure we have schema information
             if not self.collection_schema:
                 self.get_collection_schema()
             
-            # Get inferred relationships
-            relationships = self.get_collection_relationships()
+            # One listing drives both the relationships and the probes
+            collection_names = self._list_collection_names()
+            relationships = self._infer_relationships(collection_names)
             
             # Get collection statistics and indexes
-            collections_info = {}
-            
-            if self.client and self.db:
-                for collection_name in self.db.list_collection_names():
-                    collection = self.db[collection_name]
-                    
-                    # Get basic collection statistics
-                    stats = self.db.command("collStats", collection_name)
-                    
-                    # Get indexes
-                    indexes = list(collection.list_indexes())
-                    formatted_indexes = []
-                    
-                    for index in indexes:
-                        formatted_indexes.append({
-                            "name": index["name"],
-                            "keys": index["key"],
-                            "unique": index.get("unique", False)
-                        })
-                    
-                    # Sample documents for schema inference
-                    sample_docs = list(collection.find().limit(5))
-                    samples = json.loads(json_util.dumps(sample_docs))
-                    
-                    collections_info[collection_name] = {
-                        "count": stats.get("count", 0),
-                        "size": stats.get("size", 0),
-                        "avgObjSize": stats.get("avgObjSize", 0),
-                        "storageSize": stats.get("storageSize", 0),
-                        "fields": self.collection_schema.get(collection_name, []),
-                        "indexes": formatted_indexes,
-                        "sample_documents": samples
-                    }
+            if len(collection_names) > self.stats_collection_limit:
+                # Probing costs several round trips per collection, so very large
+                # deployments get their fields only; iter_collection_info still
+                # probes any collections a caller asks for explicitly
+                self.logger.add_log(
+                    f"{len(collection_names)} collections exceed the stats limit of "
+                    f"{self.stats_collection_limit}; skipping stats, indexes and samples"
+                )
+                schema = self.collection_schema
+                collections_info = {
+                    collection_name: {"fields": schema.get(collection_name) or []}
+                    for collection_name in collection_names
+                }
+            else:
+                probed = dict(self.iter_collection_info(collection_names))
+                
+                # Keep the server's collection order regardless of completion order
+                collections_info = {collection_name: probed[collection_name] for collection_name in collection_names}
             
             schema_info = {
-                "database": self.db.name if self.db else "unknown",
+                "database": db.name,
                 "collections": collections_info,
-                "relationships": relationships
+                "relationships": relationships,
+                "summary": _collection_summary(collections_info)
             }
             
             self.logger.add_log("Rich collection info retrieved successfully")
+            self._info_cache = (time.monotonic(), schema_info)
             return schema_info
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Error retrieving collection info: {error_msg}")
             return {
                 "collections": self.collection_schema, 
@@ -1093,6 +1952,306 @@ class MongoDBManager:
                 "error": str(e)
             }
     
+    def iter_collection_info(self, collection_names: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Probe collections and yield each one's info as soon as it is ready.
+        
+        Unlike get_collection_info, nothing is cached and no relationships are
+        inferred, so a caller streaming the results only holds the collections
+        it has not consumed yet. Stopping early cancels the probes not yet started.
+        
+        Args:
+            collection_names: Collections to probe; defaults to every user collection
+            
+        Yields:
+            (collection name, info dictionary) pairs in completion order; a
+            collection that could not be read has fields and error keys only
+        """
+        if self.client is None or self.db is None:
+            return
+        if collection_names is None:
+            collection_names = self._list_collection_names()
+        if not collection_names:
+            return
+        
+        # Each probe is a few independent round trips, so run them side by side;
+        # the index listing gets its own task so it overlaps the stats read.
+        # Never use more workers than the pool has connections to lend.
+        max_workers = min(16, 2 * len(collection_names), self.connection_params.get("maxPoolSize") or 16)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {}
+            for name in collection_names:
+                futures[executor.submit(self._probe_collection, name)] = (name, "probe")
+                futures[executor.submit(self._collection_indexes, name)] = (name, "indexes")
+            
+            pending: Dict[str, Dict[str, Any]] = {}
+            for future in as_completed(futures):
+                collection_name, part = futures[future]
+                parts = pending.setdefault(collection_name, {})
+                parts[part] = future
+                if len(parts) < 2:
+                    continue
+                del pending[collection_name]
+                
+                try:
+                    info = parts["probe"].result()
+                    info["indexes"] = parts["indexes"].result()
+                except Exception as e:
+                    # One unreadable collection shouldn't hide all the others.
+                    # Its own empty list, since results are cached and handed to callers
+                    error_msg = str(e).translate(NEWLINES_TO_SPACES)
+                    self.logger.add_log(f"❌ Error probing collection {collection_name}: {error_msg}")
+                    info = {
+                        "fields": self.collection_schema.get(collection_name) or [],
+                        "error": error_msg
+                    }
+                yield collection_name, info
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def get_collection_info_async(self) -> Dict[str, Any]:
+        """
+        Awaitable get_collection_info for callers running on an event loop.
+        
+        The probes already overlap on the manager's thread pool, so the blocking
+        call is moved to a worker thread rather than duplicated on an async driver.
+        
+        Returns:
+            Dictionary with comprehensive collection information
+        """
+        return await asyncio.to_thread(self.get_collection_info)
+    
+    def invalidate_collection_info(self) -> None:
+        """Forget cached collection names and collection info so the next call refetches them."""
+        self._info_cache = None
+        self._collection_names_cache = None
+        self._meta_cache = {}
+    
+    def watch_schema_changes(self) -> bool:
+        """
+        Keep the collection info cache current as collections are created, dropped or renamed.
+        
+        Starts a background thread that follows a database change stream and
+        re-probes just the collection each DDL event touches. The thread stops
+        on its own once the manager disconnects or switches databases.
+        Change streams need a replica set or sharded cluster; on a standalone
+        server the watcher logs the failure and the TTLs alone apply, both for
+        the collection info and for the names _list_collection_names caches.
+        
+        Returns:
+            bool: True if a watcher was started or is already running
+        """
+        db = self.db
+        if db is None:
+            return False
+        watcher = self._schema_watcher
+        if watcher is not None and watcher.is_alive() and self._schema_watch_db is db:
+            return True
+        
+        self._schema_watcher = threading.Thread(
+            target=self._watch_schema_loop, args=(db,), name="mongo-schema-watch", daemon=True
+        )
+        self._schema_watch_db = db
+        self._schema_watcher.start()
+        return True
+    
+    def _watch_schema_loop(self, db) -> None:
+        """
+        Follow DDL events on a database and apply each one to the caches.
+        
+        Args:
+            db: Database the watcher was started for
+        """
+        pipeline = [{"$match": {"operationType": {"$in": _DDL_EVENTS}}}]
+        try:
+            try:
+                stream = db.watch(pipeline=pipeline, show_expanded_events=True, max_await_time_ms=_WATCH_AWAIT_MS)
+            except OperationFailure:
+                # Servers before 6.0 only report drop, rename and dropDatabase
+                stream = db.watch(pipeline=pipeline, max_await_time_ms=_WATCH_AWAIT_MS)
+            self.logger.add_log("Schema change watcher started for %s", db.name)
+            with stream:
+                while self.db is db:
+                    event = stream.try_next()
+                    if event is not None and self.db is db:
+                        self._apply_schema_event(event)
+        except Exception as e:
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
+            self.logger.add_log(
+                "Schema change watcher stopped, collection info now refreshes every %ss: %s",
+                self._info_ttl, error_msg
+            )
+    
+    def _apply_schema_event(self, event: Dict[str, Any]) -> None:
+        """
+        Bring the cached collection info up to date after one DDL event.
+        
+        Only the collection named in the event is re-probed; the other entries
+        and the inferred relationships are kept until the TTL expires. The
+        cached dictionaries are copied rather than changed in place, since
+        other threads may be serializing them.
+        
+        Args:
+            event: Change stream event from _watch_schema_loop
+        """
+        operation = event["operationType"]
+        name = event.get("ns", {}).get("coll")
+        if name is None or operation == "dropDatabase":
+            self.logger.add_log(f"Schema change detected ({operation}), collection info cache cleared")
+            self.invalidate_collection_info()
+            return
+        self._apply_name_event(operation, name, event)
+        cached = self._info_cache
+        if cached is None or name.startswith("system."):
+            return
+        
+        collections = dict(cached[1]["collections"])
+        try:
+            collections.pop(name, None)
+            self.collection_schema.pop(name, None)
+            if operation == "rename":
+                name = event["to"]["coll"]
+            if operation != "drop":
+                self.collection_schema[name] = self._infer_collection_fields(name)
+                info = self._probe_collection(name)
+                info["indexes"] = self._collection_indexes(name)
+                collections[name] = info
+        except Exception as e:
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
+            self.logger.add_log(f"❌ Error refreshing collection {name}, collection info cache cleared: {error_msg}")
+            self.invalidate_collection_info()
+            return
+        
+        # Keep the original timestamp so the TTL still bounds stale statistics
+        self._info_cache = (
+            cached[0],
+            {**cached[1], "collections": collections, "summary": _collection_summary(collections)}
+        )
+        self.logger.add_log(f"Schema change detected ({operation}), refreshed collection info for {name}")
+    
+    def _apply_name_event(self, operation: str, name: str, event: Dict[str, Any]) -> None:
+        """
+        Patch the cached collection names and metadata replies after one DDL event.
+        
+        Editing the listing instead of dropping it saves the next lookup a
+        listCollections round trip. A new list is built because callers may
+        still be iterating the old one.
+        
+        Args:
+            operation (str): Event operationType
+            name (str): Collection the event applies to
+            event: Change stream event from _watch_schema_loop
+        """
+        new_name = event["to"]["coll"] if operation == "rename" else None
+        touched = (name, new_name)
+        self._meta_cache = {key: reply for key, reply in self._meta_cache.items() if key[1] not in touched}
+        
+        cached = self._collection_names_cache
+        if cached is None:
+            return
+        names = cached[1]
+        if operation in ("drop", "rename"):
+            names = [existing for existing in names if existing != name]
+        if new_name is not None:
+            name = new_name
+        if operation != "drop" and name not in names and not name.startswith("system."):
+            names = names + [name]
+        if names is not cached[1]:
+            # Keep the original timestamp so the TTL still bounds missed events
+            self._collection_names_cache = (cached[0], names)
+    
+    def _collection_stats(self, collection) -> Dict[str, Any]:
+        """
+        Read a collection's document count and sizes through $collStats.
+        
+        The aggregation stage is the supported replacement for the deprecated
+        collStats command and takes lighter locks. Sharded collections return
+        one document per shard, so the figures are summed. Servers or
+        namespaces that reject the stage (views, for example) fall back to
+        the collStats command.
+        
+        The count is the one kept in collection metadata, the same figure
+        estimated_document_count() returns, so no documents are scanned.
+        
+        Args:
+            collection: pymongo Collection to inspect
+            
+        Returns:
+            Dictionary with count, size, avgObjSize and storageSize
+        """
+        try:
+            shards = list(collection.aggregate([{"$collStats": {"storageStats": {}}}]))
+        except OperationFailure:
+            return self.db.command("collStats", collection.name)
+        
+        totals = {"count": 0, "size": 0, "storageSize": 0}
+        for shard in shards:
+            storage = shard.get("storageStats", {})
+            for key in totals:
+                totals[key] += storage.get(key, 0)
+        totals["avgObjSize"] = totals["size"] // totals["count"] if totals["count"] else 0
+        return totals
+    
+    def _probe_collection(self, collection_name: str) -> Dict[str, Any]:
+        """
+        Gather statistics and sample documents for one collection.
+        
+        Args:
+            collection_name: Name of the collection to probe
+            
+        Returns:
+            Dictionary with the collection's statistics, fields and samples
+        """
+        collection = self._coll(collection_name)
+        
+        # Get basic collection statistics
+        stats = self._collection_stats(collection)
+        
+        # Sample documents for schema inference. Small collections are cheap to
+        # read from the start; larger ones get a random sample so the examples
+        # are not all taken from the oldest documents
+        if stats.get("count", 0) >= _RANDOM_SAMPLE_MIN_COUNT:
+            sample_cursor = collection.aggregate([{"$sample": {"size": PROBE_SAMPLE_SIZE}}], allowDiskUse=False)
+        else:
+            sample_cursor = collection.find().limit(PROBE_SAMPLE_SIZE)
+        # Convert as the cursor yields, so raw and converted copies don't coexist.
+        # Samples only illustrate the fields, so long text and blobs are cut short
+        samples = [_truncate_strings(_to_jsonable(doc), SAMPLE_STRING_LIMIT) for doc in sample_cursor]
+        
+        return {
+            "count": stats.get("count", 0),
+            # Both stats sources report the storage engine's metadata counter,
+            # which can drift after unclean shutdowns; it is not a counted scan
+            "count_estimated": True,
+            "size": stats.get("size", 0),
+            "avgObjSize": stats.get("avgObjSize", 0),
+            "storageSize": stats.get("storageSize", 0),
+            "fields": self.collection_schema.get(collection_name, []),
+            # Filled in by get_collection_info from _collection_indexes
+            "indexes": [],
+            "sample_documents": samples
+        }
+    
+    def _collection_indexes(self, collection_name: str) -> List[Dict[str, Any]]:
+        """
+        List the indexes of one collection.
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            List of {name, keys, unique} dictionaries
+        """
+        return [
+            {
+                "name": index["name"],
+                "keys": index["key"],
+                "unique": index.get("unique", False)
+            }
+            for index in self._coll(collection_name).list_indexes()
+        ]
+    
     def get_rich_schema_info(self) -> Dict[str, Any]:
         """
         Alias for get_collection_info to maintain API compatibility with PostgresDBManager.
@@ -1100,4 +2259,29 @@ class MongoDBManager:
         Returns:
             Dictionary with comprehensive collection information
         """
-        return self.get_collection_info()
\ No newline at end of file
+        return self.get_collection_info()
+
+
+_mongo_manager = None
+_mongo_manager_lock = threading.Lock()
+
+
+def get_mongo_manager(logger: Logger, query_cache_size: int = 0) -> MongoDBManager:
+    """
+    Return the process-wide MongoDB manager, creating it on first use.
+
+    The manager owns a single pooled MongoClient, so every caller shares
+    the same connection pool instead of opening its own.
+
+    Args:
+        logger (Logger): Logger instance used if the manager is created
+        query_cache_size (int, optional): Query results cached if the manager is created
+
+    Returns:
+        MongoDBManager: The shared manager
+    """
+    global _mongo_manager
+    with _mongo_manager_lock:
+        if _mongo_manager is None:
+            _mongo_manager = MongoDBManager(logger, query_cache_size=query_cache_size)
+        return _mongo_manager
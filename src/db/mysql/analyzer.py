@@ -5,14 +5,14 @@ import os
 import json
 import pandas as pd
 from src.logger import Logger
-from dotenv import load_dotenv
 from typing import Dict, Optional, Any
 
-from ...utils import format_markdown_table
+from ...utils import format_markdown_table, sample_rows, summarize_for_prompt, DBConfig
 from .database import MySQLDBManager
 from ...llm.openai_client import OpenAIClient
-from ...visualization import create_visualization
-load_dotenv()
+from ...registry import registry
+from ...visualization import create_visualization, VISUALIZATION_RE
+MYSQL_CFG = DBConfig.from_env("MYSQL_DB_")
 
 class MySQLDBAnalyzer:
     """Database analyzer that uses LLMs to translate natural language to SQL and analyze results."""
@@ -23,6 +23,7 @@ class MySQLDBAnalyzer:
         # openai_api_key: Optional[str] = None,
         openai_model: str = "gpt-4o-mini",
         # mcp_api_key: Optional[str] = None
+        openai_client: Optional[OpenAIClient] = None,
     ):
         """
         Initialize the DB Analyzer.
@@ -32,13 +33,20 @@ class MySQLDBAnalyzer:
             openai_api_key: OpenAI API key
             openai_model: OpenAI model to use
             mcp_api_key: MCP API key
+            openai_client: Client to use; defaults to the shared registry client
         """
 
         logger = Logger()
         openai_api_key= os.environ.get("OPENAI_API_KEY")
         self.db_manager = MySQLDBManager(logger)
        
-        self.openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        if openai_client is None:
+            # Share one HTTP client across analyzers unless a different model is requested
+            if openai_model == registry.openai.model:
+                openai_client = registry.openai
+            else:
+                openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        self.openai_client = openai_client
         # self.mcp_client = MCPClient(api_key=mcp_api_key)
         
     def initialize(self) -> bool:
@@ -48,14 +56,13 @@ class MySQLDBAnalyzer:
         Returns:
             bool: True if all connections successful, False otherwise
         """
+        if MYSQL_CFG.error:
+            self.db_manager.logger.add_log(f"❌ MySQL configuration error: {MYSQL_CFG.error}")
+            return False
 
-        host = os.environ.get("MYSQL_DB_HOST")
-        port = os.environ.get("MYSQL_DB_PORT")
-        database = os.environ.get("MYSQL_DB_NAME")  
-        user = os.environ.get("MYSQL_DB_USER")
-        password = os.environ.get("MYSQL_DB_PASSWORD")
-
-        db_success = self.db_manager.connect(host, port, database, user, password)
+        db_success = self.db_manager.connect(
+            MYSQL_CFG.host, MYSQL_CFG.port, MYSQL_CFG.dbname, MYSQL_CFG.user, MYSQL_CFG.password
+        )
         openai_success = self.openai_client.initialize()
         # mcp_success = self.mcp_client.initialize()
 
@@ -140,12 +147,8 @@ class MySQLDBAnalyzer:
         if data is None or data.empty:
             return "No data available for analysis."
             
-        # Convert data to string representation
-        data_description = data.head(100).to_string()
-        if len(data) > 100:
-            data_description += f"\n\n[Note: showing only first 100 rows of {len(data)} total rows]"
-            
-        data_stats = data.describe().to_string()
+        # Sample and statistics come from one head slice
+        data_description, data_stats = summarize_for_prompt(data)
             
         system_message = """You are an expert data analyst specializing in database analysis. 
         Provide insightful, actionable analysis based on the data. Format your response in well-structured markdown."""
@@ -197,11 +200,7 @@ class MySQLDBAnalyzer:
         Returns:
             True if visualization should be generated
         """
-        visualization_keywords = [
-            'chart', 'graph', 'plot', 'visualize', 'visualization', 
-            'distribution', 'trend', 'compare', 'show me'
-        ]
-        return any(keyword in request.lower() for keyword in visualization_keywords)
+        return VISUALIZATION_RE.search(request) is not None
     
     def process_request(self, request: str) -> Dict[str, Any]:
         """
@@ -260,7 +259,7 @@ class MySQLDBAnalyzer:
                 print(f"⚠️ Warning: Failed to generate visualization: {e}")
         
         # Include sample data
-        sample_data = data.head(10) if len(data) > 10 else data
+        sample_data = sample_rows(data)
         result["sample_data"] = format_markdown_table(sample_data)
         
         result["success"] = True
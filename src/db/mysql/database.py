@@ -1,7 +1,7 @@
 import re
 import mysql.connector
 import pandas as pd
-from src.logger import Logger
+from src.logger import Logger, NEWLINES_TO_SPACES
 from typing import Dict, List, Optional, Any, Tuple
 
 
@@ -99,7 +99,7 @@ class MySQLDBManager:
             
             return True
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"Database connection failed: {error_msg}")
             return False
     
@@ -167,7 +167,7 @@ class MySQLDBManager:
                     return {"error": f"Unexpected error with read-only query: {str(e)}"}
                     
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"Query execution failed: {error_msg}")
             self.connection.rollback()
             return {"error": f"Query execution failed: {error_msg}"}
@@ -322,7 +322,7 @@ class MySQLDBManager:
             self.logger.add_log(f"Query to DataFrame executed successfully: {query[:50]}{'...' if len(query) > 50 else ''}")
             return result
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Query to DataFrame execution error: {error_msg}")
             return None
             
@@ -381,7 +381,7 @@ class MySQLDBManager:
             return relationships
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Error retrieving table relationships: {error_msg}")
             return {}
             
@@ -455,6 +455,6 @@ class MySQLDBManager:
             return schema_info
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Error retrieving rich schema info: {error_msg}")
             return {"tables": self.table_schema, "relationships": {}, "error": str(e)}
\ No newline at end of file
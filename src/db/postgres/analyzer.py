@@ -5,14 +5,14 @@ import os
 import json
 import pandas as pd
 from src.logger import Logger
-from dotenv import load_dotenv
 from typing import Dict, Optional, Any
 
-from ...utils import format_markdown_table
-from .database import PostgresDBManager
+from ...utils import format_markdown_table, sample_rows, summarize_for_prompt, DBConfig
+from .database import get_postgres_manager
 from ...llm.openai_client import OpenAIClient
-from ...visualization import create_visualization
-load_dotenv()
+from ...registry import registry
+from ...visualization import create_visualization, VISUALIZATION_RE
+DB_CFG = DBConfig.from_env("DB_")
 
 class PostgresDBAnalyzer:
     """Database analyzer that uses LLMs to translate natural language to SQL and analyze results."""
@@ -23,6 +23,7 @@ class PostgresDBAnalyzer:
         # openai_api_key: Optional[str] = None,
         openai_model: str = "gpt-4o-mini",
         # mcp_api_key: Optional[str] = None
+        openai_client: Optional[OpenAIClient] = None,
     ):
         """
         Initialize the DB Analyzer.
@@ -32,13 +33,20 @@ class PostgresDBAnalyzer:
             openai_api_key: OpenAI API key
             openai_model: OpenAI model to use
             mcp_api_key: MCP API key
+            openai_client: Client to use; defaults to the shared registry client
         """
 
         logger = Logger()
         openai_api_key= os.environ.get("OPENAI_API_KEY")
-        self.db_manager = PostgresDBManager(logger)
+        self.db_manager = get_postgres_manager(logger)
        
-        self.openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        if openai_client is None:
+            # Share one HTTP client across analyzers unless a different model is requested
+            if openai_model == registry.openai.model:
+                openai_client = registry.openai
+            else:
+                openai_client = OpenAIClient(api_key=openai_api_key, model=openai_model)
+        self.openai_client = openai_client
         # self.mcp_client = MCPClient(api_key=mcp_api_key)
         
     def initialize(self) -> bool:
@@ -48,15 +56,14 @@ class PostgresDBAnalyzer:
         Returns:
             bool: True if all connections successful, False otherwise
         """
+        if DB_CFG.error:
+            self.db_manager.logger.add_log(f"❌ PostgreSQL configuration error: {DB_CFG.error}")
+            return False
 
-
-        host = os.environ.get("DB_HOST")
-        port = os.environ.get("DB_PORT")
-        dbname = os.environ.get("DB_NAME")
-        user = os.environ.get("DB_USER")
-        password = os.environ.get("DB_PASSWORD")
-
-        db_success = self.db_manager.connect(host, port, dbname, user, password)
+        # The shared manager keeps its pool open, so only connect once
+        db_success = self.db_manager.pool is not None or self.db_manager.connect(
+            DB_CFG.host, DB_CFG.port, DB_CFG.dbname, DB_CFG.user, DB_CFG.password
+        )
         openai_success = self.openai_client.initialize()
         # mcp_success = self.mcp_client.initialize()
 
@@ -134,12 +141,8 @@ class PostgresDBAnalyzer:
         if data is None or data.empty:
             return "No data available for analysis."
             
-        # Convert data to string representation
-        data_description = data.head(100).to_string()
-        if len(data) > 100:
-            data_description += f"\n\n[Note: showing only first 100 rows of {len(data)} total rows]"
-            
-        data_stats = data.describe().to_string()
+        # Sample and statistics come from one head slice
+        data_description, data_stats = summarize_for_prompt(data)
             
         system_message = """You are an expert data analyst specializing in database analysis. 
         Provide insightful, actionable analysis based on the data. Format your response in well-structured markdown."""
@@ -191,11 +194,7 @@ class PostgresDBAnalyzer:
         Returns:
             True if visualization should be generated
         """
-        visualization_keywords = [
-            'chart', 'graph', 'plot', 'visualize', 'visualization', 
-            'distribution', 'trend', 'compare', 'show me'
-        ]
-        return any(keyword in request.lower() for keyword in visualization_keywords)
+        return VISUALIZATION_RE.search(request) is not None
     
     def process_request(self, request: str) -> Dict[str, Any]:
         """
@@ -254,7 +253,7 @@ class PostgresDBAnalyzer:
                 print(f"⚠️ Warning: Failed to generate visualization: {e}")
         
         # Include sample data
-        sample_data = data.head(10) if len(data) > 10 else data
+        sample_data = sample_rows(data)
         result["sample_data"] = format_markdown_table(sample_data)
         
         result["success"] = True
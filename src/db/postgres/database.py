@@ -1,29 +1,42 @@
 import re
+import threading
 import psycopg2
 import pandas as pd
-from src.logger import Logger
+from psycopg2 import pool
+from contextlib import contextmanager
+from src.logger import Logger, NEWLINES_TO_SPACES
 from typing import Dict, List, Optional, Any, Tuple
 
 
 class PostgresDBManager:
     """Class for managing database connections to PostgreSQL."""
     
-    def __init__(self, logger: Logger, connection_params: Dict[str, Any] = None):
+    def __init__(self, logger: Logger, connection_params: Dict[str, Any] = None,
+                 min_connections: int = 2, max_connections: int = 20,
+                 idle_in_transaction_timeout: int = 300000):
         """
         Initialize the database manager with connection parameters.
         
         Args:
             logger (Logger): Logger instance for logging operations
             connection_params (Dict[str, Any], optional): Dictionary of connection parameters
+            min_connections (int, optional): Connections kept open in the pool
+            max_connections (int, optional): Maximum connections the pool may open
+            idle_in_transaction_timeout (int, optional): Milliseconds a session may sit
+                idle inside a transaction before the server ends it
         """
         self.logger = logger
         self.connection_params = connection_params or {}
         # Set default timeout values if not provided
         if 'connect_timeout' not in self.connection_params:
             self.connection_params['connect_timeout'] = 60  # Default 60 seconds for connection timeout
+        self.idle_in_transaction_timeout = idle_in_transaction_timeout
         if 'options' not in self.connection_params:
-            self.connection_params['options'] = '-c statement_timeout=300000'  # Default 5 minutes for query execution
-        self.connection = None
+            # Default 5 minutes for query execution
+            self.connection_params['options'] = self._session_options(300000)
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.pool = None
         self.table_schema = {}
 
     
@@ -64,30 +77,48 @@ class PostgresDBManager:
         if connect_timeout:
             self.connection_params["connect_timeout"] = connect_timeout
         if statement_timeout:
-            self.connection_params["options"] = f'-c statement_timeout={statement_timeout}'
+            self.connection_params["options"] = self._session_options(statement_timeout)
             
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            # Session settings travel in "options" so every pooled connection gets them
+            self.pool = pool.ThreadedConnectionPool(self.min_connections, self.max_connections, **self.connection_params)
             self.logger.add_log(f"Database Postgres connection successful - Host:")
             
-            # Set session parameters for all connections
-            with self.connection.cursor() as cursor:
-                # Set idle_in_transaction_session_timeout to prevent idle sessions
-                cursor.execute("SET idle_in_transaction_session_timeout = '300000';")  # 5 minutes
-                self.connection.commit()
-            
             return True
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"Database connection failed: {error_msg}")
             return False
     
     def disconnect(self) -> None:
-        """Close the database connection if it exists."""
-        if self.connection:
-            self.connection.close()
+        """Close the connection pool and all of its connections if it exists."""
+        if self.pool:
+            self.pool.closeall()
             self.logger.add_log("Database connection closed")
-            self.connection = None
+            self.pool = None
+
+    def _session_options(self, statement_timeout: int) -> str:
+        """
+        Build the libpq options string that applies the session timeouts.
+        
+        Args:
+            statement_timeout (int): Statement timeout in milliseconds
+            
+        Returns:
+            str: Value for the "options" connection parameter
+        """
+        return (f'-c statement_timeout={statement_timeout} '
+                f'-c idle_in_transaction_session_timeout={self.idle_in_transaction_timeout}')
+    
+    @contextmanager
+    def borrow_connection(self):
+        """Borrow a connection from the pool and give it back when done."""
+        connection = self.pool.getconn()
+        try:
+            yield connection
+        finally:
+            # putconn rolls back any open transaction, resetting per-query SET commands
+            self.pool.putconn(connection)
     
     def execute_query(self, query: str, params: tuple = None, timeout: int = None) -> Optional[list]:
         """
@@ -103,44 +134,43 @@ class PostgresDBManager:
         Returns:
             Optional[list]: Query results or None if failed or blocked
         """
-        if not self.connection:
+        if not self.pool:
             self.logger.add_log("Query execution failed: No active database connection")
             return None
             
         # Normalize query for safety checks
         normalized_query = query.strip().upper()
-        try:
-            # Check if query is safe
-            if not self.is_read_only_query(normalized_query) or self.contains_unsafe_operations(normalized_query):
-                self.logger.add_log(f"Query blocked: Non-read operation detected in query: {query[:50]}{'...' if len(query) > 50 else ''}")
-                return {"error": "Operation blocked -  Non-read operation detected in query"}
+        # Check if query is safe
+        if not self.is_read_only_query(normalized_query) or self.contains_unsafe_operations(normalized_query):
+            self.logger.add_log(f"Query blocked: Non-read operation detected in query: {query[:50]}{'...' if len(query) > 50 else ''}")
+            return {"error": "Operation blocked -  Non-read operation detected in query"}
 
+        try:
+            with self.borrow_connection() as connection:
+                # If we got here, the query is safe to execute
+                cursor = connection.cursor()
                 
-            # If we got here, the query is safe to execute
-            cursor = self.connection.cursor()
-            
-            # Set a specific timeout for this query if requested
-            if timeout:
-                cursor.execute(f"SET statement_timeout = {timeout};")
-            
-            cursor.execute(query, params or ())
-            
-            try:
-                results = cursor.fetchall()
-                self.logger.add_log(f"Read query executed successfully: {query[:50]}{'...' if len(query) > 50 else ''}")
-                return results
-            except psycopg2.ProgrammingError as e:
-                # This should not happen with properly filtered read-only queries
-                # But handle it gracefully just in case
-                self.logger.add_log(f"Unexpected error with read-only query: {str(e)}")
-                self.connection.rollback()
-                return {"error": f"Unexpected error with read-only query: {str(e)}"}
+                # Set a specific timeout for this query if requested
+                if timeout:
+                    cursor.execute(f"SET statement_timeout = {timeout};")
+                
+                cursor.execute(query, params or ())
+                
+                try:
+                    results = cursor.fetchall()
+                    self.logger.add_log(f"Read query executed successfully: {query[:50]}{'...' if len(query) > 50 else ''}")
+                    return results
+                except psycopg2.ProgrammingError as e:
+                    # This should not happen with properly filtered read-only queries
+                    # But handle it gracefully just in case
+                    self.logger.add_log(f"Unexpected error with read-only query: {str(e)}")
+                    return {"error": f"Unexpected error with read-only query: {str(e)}"}
 
-                    
+        # Covers an exhausted pool and dead connections as well as query errors;
+        # putconn rolls back whatever the failed query left open
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"Query execution failed: {error_msg}")
-            self.connection.rollback()
             return {"error": f"Query execution failed: {error_msg}"}
 
     
@@ -213,39 +243,40 @@ class PostgresDBManager:
         """
         self.logger.add_log("Retrieving table schema...")
 
-        if not self.connection:
+        if not self.pool:
             self.logger.add_log("Database not connected")
             return False
             
         try:
-            cursor = self.connection.cursor()
-            
-            # Set a longer timeout for schema operations which might be slow on large databases
-            cursor.execute("SET statement_timeout = 600000;")  # 10 minutes
-            
-            # Get list of tables
-            cursor.execute("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                AND table_type = 'BASE TABLE'
-            """)
+            with self.borrow_connection() as connection:
+                cursor = connection.cursor()
             
-            tables = [row[0] for row in cursor.fetchall()]
+                # Set a longer timeout for schema operations which might be slow on large databases
+                cursor.execute("SET statement_timeout = 600000;")  # 10 minutes
             
-            # Get columns for each table
-            for table in tables:
-                cursor.execute(f"""
-                    SELECT column_name, data_type, is_nullable
-                    FROM information_schema.columns
+                # Get list of tables
+                cursor.execute("""
+                    SELECT table_name 
+                    FROM information_schema.tables 
                     WHERE table_schema = 'public'
-                    AND table_name = '{table}'
+                    AND table_type = 'BASE TABLE'
                 """)
+            
+                tables = [row[0] for row in cursor.fetchall()]
+            
+                # Get columns for each table
+                for table in tables:
+                    cursor.execute(f"""
+                        SELECT column_name, data_type, is_nullable
+                        FROM information_schema.columns
+                        WHERE table_schema = 'public'
+                        AND table_name = '{table}'
+                    """)
                 
-                columns = [{"name": row[0], "type": row[1], "nullable": row[2]} for row in cursor.fetchall()]
-                self.table_schema[table] = columns
+                    columns = [{"name": row[0], "type": row[1], "nullable": row[2]} for row in cursor.fetchall()]
+                    self.table_schema[table] = columns
                 
-            cursor.close()
+                cursor.close()
             self.logger.add_log(f"✅ Retrieved schema for {len(tables)} tables")
             return True
             
@@ -265,22 +296,22 @@ class PostgresDBManager:
         Returns:
             DataFrame containing query results or None if failed
         """
-        if not self.connection:
+        if not self.pool:
             self.logger.add_log("Database not connected")
             return None
             
         try:
-            # Create a new connection with specified timeout if needed
-            if timeout:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(f"SET statement_timeout = {timeout};")
-                    self.connection.commit()
-            
-            result = pd.read_sql(query, self.connection, params=params)
+            with self.borrow_connection() as connection:
+                # Not committed, so the timeout ends with this query's transaction
+                if timeout:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"SET statement_timeout = {timeout};")
+                
+                result = pd.read_sql(query, connection, params=params)
             self.logger.add_log(f"Query to DataFrame executed successfully: {query[:50]}{'...' if len(query) > 50 else ''}")
             return result
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Query to DataFrame execution error: {error_msg}")
             return None
             
@@ -291,51 +322,52 @@ class PostgresDBManager:
         Returns:
             Dictionary of table relationships
         """
-        if not self.connection:
+        if not self.pool:
             self.logger.add_log("Database not connected")
             return {}
             
         try:
-            cursor = self.connection.cursor()
+            with self.borrow_connection() as connection:
+                cursor = connection.cursor()
             
-            # Set a longer timeout for schema operations
-            cursor.execute("SET statement_timeout = 600000;")  # 10 minutes
+                # Set a longer timeout for schema operations
+                cursor.execute("SET statement_timeout = 600000;")  # 10 minutes
             
-            cursor.execute("""
-                SELECT
-                    tc.table_name AS table_name, 
-                    kcu.column_name AS column_name, 
-                    ccu.table_name AS foreign_table_name,
-                    ccu.column_name AS foreign_column_name 
-                FROM 
-                    information_schema.table_constraints AS tc 
-                    JOIN information_schema.key_column_usage AS kcu
-                      ON tc.constraint_name = kcu.constraint_name
-                      AND tc.table_schema = kcu.table_schema
-                    JOIN information_schema.constraint_column_usage AS ccu
-                      ON ccu.constraint_name = tc.constraint_name
-                      AND ccu.table_schema = tc.table_schema
-                WHERE tc.constraint_type = 'FOREIGN KEY';
-            """)
+                cursor.execute("""
+                    SELECT
+                        tc.table_name AS table_name, 
+                        kcu.column_name AS column_name, 
+                        ccu.table_name AS foreign_table_name,
+                        ccu.column_name AS foreign_column_name 
+                    FROM 
+                        information_schema.table_constraints AS tc 
+                        JOIN information_schema.key_column_usage AS kcu
+                          ON tc.constraint_name = kcu.constraint_name
+                          AND tc.table_schema = kcu.table_schema
+                        JOIN information_schema.constraint_column_usage AS ccu
+                          ON ccu.constraint_name = tc.constraint_name
+                          AND ccu.table_schema = tc.table_schema
+                    WHERE tc.constraint_type = 'FOREIGN KEY';
+                """)
             
-            relationships = {}
-            for row in cursor.fetchall():
-                table_name, column_name, foreign_table, foreign_column = row
-                if table_name not in relationships:
-                    relationships[table_name] = []
+                relationships = {}
+                for row in cursor.fetchall():
+                    table_name, column_name, foreign_table, foreign_column = row
+                    if table_name not in relationships:
+                        relationships[table_name] = []
                     
-                relationships[table_name].append({
-                    "column": column_name,
-                    "references_table": foreign_table,
-                    "references_column": foreign_column
-                })
+                    relationships[table_name].append({
+                        "column": column_name,
+                        "references_table": foreign_table,
+                        "references_column": foreign_column
+                    })
                 
-            cursor.close()
+                cursor.close()
             self.logger.add_log("Retrieved table relationships successfully")
             return relationships
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Error retrieving table relationships: {error_msg}")
             return {}
             
@@ -355,10 +387,10 @@ class PostgresDBManager:
             }
             
             # Get index information
-            if self.connection:
+            if self.pool:
                 indexes = {}
                 
-                with self.connection.cursor() as cursor:
+                with self.borrow_connection() as connection, connection.cursor() as cursor:
                     # Set a longer timeout for schema operations
                     cursor.execute("SET statement_timeout = 600000;")  # 10 minutes
                     
@@ -411,6 +443,30 @@ class PostgresDBManager:
             return schema_info
             
         except Exception as e:
-            error_msg = str(e).replace("\n", " ")
+            error_msg = str(e).translate(NEWLINES_TO_SPACES)
             self.logger.add_log(f"❌ Error retrieving rich schema info: {error_msg}")
-            return {"tables": self.table_schema, "relationships": {}, "error": str(e)}
\ No newline at end of file
+            return {"tables": self.table_schema, "relationships": {}, "error": str(e)}
+
+
+_postgres_manager = None
+_postgres_manager_lock = threading.Lock()
+
+
+def get_postgres_manager(logger: Logger) -> PostgresDBManager:
+    """
+    Return the process-wide PostgreSQL manager, creating it on first use.
+
+    The manager owns a single connection pool, so every caller borrows
+    from it instead of opening its own connection.
+
+    Args:
+        logger (Logger): Logger instance used if the manager is created
+
+    Returns:
+        PostgresDBManager: The shared manager
+    """
+    global _postgres_manager
+    with _postgres_manager_lock:
+        if _postgres_manager is None:
+            _postgres_manager = PostgresDBManager(logger)
+        return _postgres_manager
@@ -3,32 +3,58 @@ OpenAI API client wrapper for LLM functionality.
 """
 
 import os
-from typing import Optional, Dict, Any, List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Iterator
 
 import openai
 
 class OpenAIClient:
     """Client for interacting with OpenAI API."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini", cache_size: int = 256):
         """
         Initialize OpenAI client.
         
         Args:
             api_key: OpenAI API key
             model: Model to use for completions
+            cache_size: Maximum number of completions kept for cache=True calls
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model
         self.client = None
+        self._init_lock = threading.Lock()
+        self.cache_size = cache_size
+        self._completion_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         
     def initialize(self) -> bool:
         """
         Initialize OpenAI client with API key.
         
+        The underlying client is created once and reused by later calls, so
+        its HTTP connection pool survives between requests.
+        
         Returns:
             bool: True if initialization successful, False otherwise
         """
+        if self.client is not None:
+            return True
+        
+        with self._init_lock:
+            if self.client is not None:
+                return True
+            return self._create_client()
+    
+    def _create_client(self) -> bool:
+        """
+        Create the underlying OpenAI client.
+        
+        Returns:
+            bool: True if the client was created, False otherwise
+        """
         try:
             if not self.api_key:
                 print("❌ OpenAI API key not found. Set OPENAI_API_KEY environment variable or provide in config.")
@@ -41,11 +67,46 @@ class OpenAIClient:
             print(f"❌ OpenAI API connection error: {e}")
             return False
     
+    def _cache_key(self, system_message: str, user_message: str, temperature: float) -> bytes:
+        """
+        Hash everything that determines a completion into a compact cache key.
+        
+        Args:
+            system_message: System message to set context
+            user_message: User message with prompt
+            temperature: Temperature for generation (0-1)
+            
+        Returns:
+            Digest identifying the completion request
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.model, repr(temperature), system_message, user_message):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Return a cached completion and mark it as recently used."""
+        with self._cache_lock:
+            text = self._completion_cache.get(key)
+            if text is not None:
+                self._completion_cache.move_to_end(key)
+            return text
+    
+    def _cache_put(self, key: bytes, text: str) -> None:
+        """Store a completion, evicting the least recently used one when full."""
+        with self._cache_lock:
+            self._completion_cache[key] = text
+            self._completion_cache.move_to_end(key)
+            while len(self._completion_cache) > self.cache_size:
+                self._completion_cache.popitem(last=False)
+    
     def generate_completion(
         self, 
         system_message: str, 
         user_message: str,
-        temperature: float = 0.2
+        temperature: float = 0.2,
+        cache: bool = False
     ) -> Optional[str]:
         """
         Generate a completion using OpenAI API.
@@ -54,6 +115,7 @@ class OpenAIClient:
             system_message: System message to set context
             user_message: User message with prompt
             temperature: Temperature for generation (0-1)
+            cache: Reuse the response of an identical earlier request
             
         Returns:
             Generated text or None if failed
@@ -61,6 +123,13 @@ class OpenAIClient:
         if not self.client:
             print("OpenAI client not initialized")
             return None
+        
+        key = None
+        if cache:
+            key = self._cache_key(system_message, user_message, temperature)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
             
         try:
             response = self.client.chat.completions.create(
@@ -72,12 +141,80 @@ class OpenAIClient:
                 temperature=temperature
             )
             
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+            if key is not None and content:
+                self._cache_put(key, content)
+            return content
             
         except Exception as e:
             print(f"❌ Error generating completion: {e}")
             return None
             
+    def stream_completion(
+        self, 
+        system_message: str, 
+        user_message: str,
+        temperature: float = 0.2,
+        cache: bool = False
+    ) -> Iterator[str]:
+        """
+        Stream a completion using OpenAI API, yielding text as it arrives.
+        
+        Closing the generator before it is exhausted closes the HTTP stream,
+        so callers can stop a generation they no longer need. With cache=True
+        a previously completed identical request is replayed as a single piece,
+        and only streams that ran to the end are stored.
+        
+        Args:
+            system_message: System message to set context
+            user_message: User message with prompt
+            temperature: Temperature for generation (0-1)
+            cache: Reuse the response of an identical earlier request
+            
+        Yields:
+            Pieces of generated text; nothing if the request failed
+        """
+        if not self.client:
+            print("OpenAI client not initialized")
+            return
+        
+        key = None
+        if cache:
+            key = self._cache_key(system_message, user_message, temperature)
+            cached = self._cache_get(key)
+            if cached is not None:
+                yield cached
+                return
+            
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_message},
+                    {"role": "user", "content": user_message}
+                ],
+                temperature=temperature,
+                stream=True
+            )
+        except Exception as e:
+            print(f"❌ Error generating completion: {e}")
+            return
+            
+        pieces = []
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    pieces.append(chunk.choices[0].delta.content)
+                    yield pieces[-1]
+        except Exception as e:
+            print(f"❌ Error streaming completion: {e}")
+            return
+        finally:
+            stream.close()
+        
+        if key is not None and pieces:
+            self._cache_put(key, "".join(pieces))
+            
     def get_embedding(self, text: str) -> Optional[List[float]]:
         """
         Get embedding vector for text.
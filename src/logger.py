@@ -1,21 +1,50 @@
 import os
+import sys
+import atexit
 import datetime
+import threading
+from collections import deque
+
+
+# Translation table that keeps a message on one log line
+NEWLINES_TO_SPACES = str.maketrans({"\n": " ", "\r": " "})
+
 
 class Logger:
-    """Class for handling logging operations to a file."""
+    """
+    Class for handling logging operations to a file.
     
-    def __init__(self, log_file_path: str = None):
+    Entries are buffered in memory and written in batches by a background
+    thread, so add_log does not touch the disk on every call.
+    """
+    
+    def __init__(self, log_file_path: str = None, flush_interval: float = 0.25, flush_threshold: int = 4096,
+                 enabled: bool = True, max_buffered: int = 100_000):
         """
         Initialize the logger with a specific log file path.
         
         Args:
             log_file_path (str, optional): Path to the logs file. If None, uses default path.
+            flush_interval (float, optional): Seconds between background flushes.
+            flush_threshold (int, optional): Buffered entries that trigger an early flush.
+            enabled (bool, optional): Whether add_log records anything at all.
+            max_buffered (int, optional): Most entries held in memory; the oldest are
+                dropped first if the file can't be written for a while.
         """
         if log_file_path is None:
             self.log_file = os.path.join(os.path.dirname(__file__), "logs.txt")
         else:
             self.log_file = log_file_path
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.enabled = enabled
+        self._buffer = deque(maxlen=max_buffered)
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher = None
         self._ensure_file()
+        atexit.register(self.flush)
     
     def _ensure_file(self) -> None:
         """Ensure the log file exists."""
@@ -23,23 +52,81 @@ class Logger:
             with open(self.log_file, "w") as f:
                 f.write("")
     
-    def add_log(self, message: str) -> str:
+    def is_enabled(self) -> bool:
+        """Return True if add_log currently records entries."""
+        return self.enabled
+    
+    def add_log(self, message: str, *args) -> str:
         """
         Append a new log to the file.
         
+        When args are given the message is %-formatted with them, and only if
+        logging is enabled, so callers can log large objects without paying
+        for their string conversion up front.
+        
         Args:
             message (str): The log content to be added.
+            *args: Optional values substituted into message with % formatting.
             
         Returns:
             str: Confirmation message indicating the log was saved.
         """
+        if not self.enabled:
+            return "Logging disabled."
+        if args:
+            message = message % args
         timestamp = datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
         log_entry = f"{timestamp} {message}"
         
-        with open(self.log_file, "a") as f:
-            f.write(log_entry + "\n")
+        with self._buffer_lock:
+            self._buffer.append(log_entry)
+            pending = len(self._buffer)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="logger-flush", daemon=True)
+                self._flusher.start()
+        if pending >= self.flush_threshold:
+            self._wake.set()
         return "Log saved!"
     
+    def flush(self) -> None:
+        """
+        Write all buffered log entries to the file in a single write.
+        
+        If the write fails the batch goes back to the front of the buffer so
+        the next flush retries it.
+        
+        Raises:
+            OSError: If the log file can't be written
+        """
+        # The write lock keeps batches in order when two flushes overlap
+        with self._write_lock:
+            with self._buffer_lock:
+                if not self._buffer:
+                    return
+                lines = list(self._buffer)
+                self._buffer.clear()
+            try:
+                with open(self.log_file, "a") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError:
+                with self._buffer_lock:
+                    # Re-queue ahead of newer entries; maxlen trims the oldest
+                    lines.extend(self._buffer)
+                    self._buffer.clear()
+                    self._buffer.extend(lines)
+                raise
+    
+    def _flush_loop(self) -> None:
+        """Background loop that flushes periodically or when the buffer fills up."""
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                # stdout carries the MCP protocol, so report on stderr
+                print(f"❌ Error writing logs: {e}", file=sys.stderr)
+    
     def get_logs(self) -> str:
         """
         Read and return all logs from the log file.
@@ -49,6 +136,7 @@ class Logger:
                  If no logs exist, a default message is returned.
         """
         self._ensure_file()
+        self.flush()
         with open(self.log_file, "r") as f:
             content = f.read().strip()
         return content or "No logs yet."
@@ -61,6 +149,7 @@ class Logger:
             str: The last log entry. If no logs exist, a default message is returned.
         """
         self._ensure_file()
+        self.flush()
         with open(self.log_file, "r") as f:
             lines = f.readlines()
         return lines[-1].strip() if lines else "No logs yet."
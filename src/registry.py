@@ -0,0 +1,67 @@
+"""
+Process-wide registry of shared clients and analyzers.
+"""
+
+import threading
+
+from .llm.openai_client import OpenAIClient
+
+
+class ClientRegistry:
+    """
+    Lazily creates one instance of each client and analyzer per process.
+
+    Every MCP tool call goes through the same objects, so the OpenAI HTTP
+    client and the database connection pools are built only once.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        # Re-entrant because building an analyzer asks for the shared OpenAI client
+        self._lock = threading.RLock()
+        self._openai = None
+        self._mongo_analyzer = None
+        self._pg_analyzer = None
+        self._mysql_analyzer = None
+
+    @property
+    def openai(self) -> OpenAIClient:
+        """Shared OpenAI client."""
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    self._openai = OpenAIClient()
+        return self._openai
+
+    @property
+    def mongo_analyzer(self):
+        """Shared MongoDB analyzer."""
+        if self._mongo_analyzer is None:
+            with self._lock:
+                if self._mongo_analyzer is None:
+                    from .db.mongo.analyzer import MongoDBAnalyzer
+                    self._mongo_analyzer = MongoDBAnalyzer()
+        return self._mongo_analyzer
+
+    @property
+    def pg_analyzer(self):
+        """Shared PostgreSQL analyzer."""
+        if self._pg_analyzer is None:
+            with self._lock:
+                if self._pg_analyzer is None:
+                    from .db.postgres.analyzer import PostgresDBAnalyzer
+                    self._pg_analyzer = PostgresDBAnalyzer()
+        return self._pg_analyzer
+
+    @property
+    def mysql_analyzer(self):
+        """Shared MySQL analyzer."""
+        if self._mysql_analyzer is None:
+            with self._lock:
+                if self._mysql_analyzer is None:
+                    from .db.mysql.analyzer import MySQLDBAnalyzer
+                    self._mysql_analyzer = MySQLDBAnalyzer()
+        return self._mysql_analyzer
+
+
+registry = ClientRegistry()
@@ -3,11 +3,108 @@ Utility functions for the DB Analyzer.
 """
 
 import pandas as pd
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import json
 import os
+from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; fall back to plain pandas construction
+    pa = None
+
+# Environment variable values that switch a boolean setting off
+FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+
+
+@dataclass(frozen=True, slots=True)
+class DBConfig:
+    """SQL database connection settings, resolved once from the environment."""
+    host: Optional[str] = None
+    port: Optional[int] = None
+    dbname: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+    # Set when a variable could not be used, so initialize() can fail with it
+    error: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, prefix: str = "DB_") -> "DBConfig":
+        """
+        Build the config from environment variables.
+        
+        A malformed port does not raise here, at import time; it is reported
+        through the error field instead.
+        
+        Args:
+            prefix: Variable prefix, e.g. "DB_" or "MYSQL_DB_"
+            
+        Returns:
+            DBConfig with the values found in the environment
+        """
+        port = os.environ.get(f"{prefix}PORT")
+        error = None
+        try:
+            port = int(port) if port else None
+        except ValueError:
+            error = f"{prefix}PORT is not a valid port number: {port!r}"
+            port = None
+        return cls(
+            host=os.environ.get(f"{prefix}HOST"),
+            port=port,
+            dbname=os.environ.get(f"{prefix}NAME"),
+            user=os.environ.get(f"{prefix}USER"),
+            password=os.environ.get(f"{prefix}PASSWORD"),
+            error=error
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MongoConfig:
+    """MongoDB connection settings, resolved once from the environment."""
+    connection_string: Optional[str] = None
+    database: Optional[str] = None
+    # Follow DDL change events so cached collection info stays current
+    watch_schema: bool = True
+    # Read-only query results kept by the manager; 0 disables the cache
+    query_cache_size: int = 0
+    # Set when a variable could not be used, so initialize() can fail with it
+    error: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "MongoConfig":
+        """
+        Build the config from environment variables.
+        
+        A malformed cache size does not raise here, at import time; it is
+        reported through the error field instead.
+        
+        Returns:
+            MongoConfig with the values found in the environment
+        """
+        raw_cache_size = os.environ.get("MONGODB_QUERY_CACHE_SIZE")
+        error = None
+        try:
+            cache_size = int(raw_cache_size) if raw_cache_size else 0
+            if cache_size < 0:
+                raise ValueError(raw_cache_size)
+        except ValueError:
+            error = f"MONGODB_QUERY_CACHE_SIZE is not a valid entry count: {raw_cache_size!r}"
+            cache_size = 0
+        return cls(
+            connection_string=os.environ.get("MONGODB_CONNECTION_STRING"),
+            database=os.environ.get("MONGODB_DATABASE"),
+            watch_schema=os.environ.get("MONGODB_WATCH_SCHEMA", "true").strip().lower() not in FALSE_VALUES,
+            query_cache_size=cache_size,
+            error=error
+        )
+
 def load_config_from_env() -> Dict[str, Any]:
     """
     Load configuration from environment variables.
@@ -33,6 +130,69 @@ def load_config_from_env() -> Dict[str, Any]:
     }
     return config
 
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with two-space indentation
+        sort_keys: Sort dictionary keys
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None, sort_keys=sort_keys)
+
+def json_loads(text: str) -> Any:
+    """
+    Parse a JSON string, using orjson when it is installed.
+    
+    Args:
+        text: JSON string
+        
+    Returns:
+        Parsed object
+        
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from a list of dicts, columnarizing through Arrow when available.
+    
+    Args:
+        records: List of row dictionaries
+        
+    Returns:
+        DataFrame with one row per record
+    """
+    if pa is not None:
+        # Union of keys in first-seen order; from_pylist would only keep the
+        # first record's keys and silently drop fields that appear later
+        columns = dict.fromkeys(key for record in records for key in record)
+        try:
+            table = pa.Table.from_pydict({
+                column: [record.get(column) for record in records]
+                for column in columns
+            })
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Documents whose fields mix types can't share one Arrow column
+            pass
+    return pd.DataFrame(records)
+
 def format_markdown_table(df: pd.DataFrame) -> str:
     """
     Format DataFrame as markdown table.
@@ -45,6 +205,58 @@ def format_markdown_table(df: pd.DataFrame) -> str:
     """
     return df.to_markdown(index=False)
 
+def summarize_for_prompt(data: pd.DataFrame, rows: int = 100) -> Tuple[str, str]:
+    """
+    Build the data sample and statistical summary used in analysis prompts.
+    
+    Both strings come from the same head slice, so the frame is sliced once
+    and described once no matter how large the result is.
+    
+    Args:
+        data: DataFrame with query results
+        rows: Number of leading rows to include
+        
+    Returns:
+        Tuple of (data description, statistics) strings
+    """
+    head = data.head(rows)
+    total = len(data)
+    
+    data_description = head.to_string()
+    if total > rows:
+        data_description += f"\n\n[Note: showing only first {rows} rows of {total} total rows]"
+    
+    if head.empty:
+        data_stats = "No rows available for statistics."
+    else:
+        # include='all' also covers text and date columns with count/unique/top/freq
+        data_stats = head.describe(include='all').to_string()
+        data_stats += f"\n\n(stats over head sample of {len(head)}/{total} rows)"
+    
+    return data_description, data_stats
+
+def sample_rows(df: pd.DataFrame, rows: int = 10, max_width: int = 80) -> pd.DataFrame:
+    """
+    Take a small, bounded sample of a DataFrame for display.
+    
+    Text cells are cut to max_width characters so wide documents can't blow
+    up the size of the rendered table.
+    
+    Args:
+        df: DataFrame to sample
+        rows: Number of leading rows to keep
+        max_width: Maximum number of characters kept per text cell
+        
+    Returns:
+        New DataFrame with at most rows rows
+    """
+    sample = df.head(rows).copy()
+    for col in sample.columns:
+        dtype = sample[col].dtype
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            sample[col] = sample[col].astype(str).str.slice(0, max_width)
+    return sample
+
 def sanitize_filename(name: str) -> str:
     """
     Sanitize a string for use as a filename.
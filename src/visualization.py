@@ -2,13 +2,21 @@
 Data visualization functions for generating charts from query results.
 """
 
-import matplotlib.pyplot as plt
+import re
+import sys
+from matplotlib.figure import Figure
 import seaborn as sns
 import pandas as pd
 import base64
 from io import BytesIO
 from typing import Optional, List, Dict, Any, Tuple
 
+# Requests mentioning any of these words get a chart alongside the results
+VISUALIZATION_RE = re.compile(
+    r"chart|graph|plot|visuali[sz]e|visuali[sz]ation|distribution|trend|compare|show me",
+    re.IGNORECASE,
+)
+
 def detect_chart_type(data: pd.DataFrame, request: str) -> Tuple[str, str, str]:
     """
     Detect the most appropriate chart type based on data and request.
@@ -130,31 +138,37 @@ def create_visualization(data: pd.DataFrame, request: str) -> Optional[str]:
             df = df.reset_index()
             x_col = "index"
         
-        # Create figure
-        plt.figure(figsize=(10, 6))
+        # Create figure; a standalone Figure keeps no pyplot global state, so
+        # charts built on different threads can't draw into each other
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         # Create appropriate chart
         if chart_type == "bar":
             # Limit to top 20 items for readability
             if len(df) > 20:
                 top_df = df.nlargest(20, y_col) if y_col in df.columns else df.head(20)
-                sns.barplot(x=x_col, y=y_col, data=top_df)
-                plt.title(f"Top 20 by {y_col}")
+                sns.barplot(x=x_col, y=y_col, data=top_df, ax=ax)
+                ax.set_title(f"Top 20 by {y_col}")
             else:
-                sns.barplot(x=x_col, y=y_col, data=df)
-                plt.title(f"Bar Chart: {y_col} by {x_col}")
+                sns.barplot(x=x_col, y=y_col, data=df, ax=ax)
+                ax.set_title(f"Bar Chart: {y_col} by {x_col}")
             
             # Rotate x labels if there are many categories
             if len(df[x_col].unique()) > 5:
-                plt.xticks(rotation=45, ha='right')
+                ax.tick_params(axis='x', labelrotation=45)
+                for label in ax.get_xticklabels():
+                    label.set_horizontalalignment('right')
         
         elif chart_type == "line":
-            sns.lineplot(x=x_col, y=y_col, data=df)
-            plt.title(f"Line Chart: {y_col} over {x_col}")
+            sns.lineplot(x=x_col, y=y_col, data=df, ax=ax)
+            ax.set_title(f"Line Chart: {y_col} over {x_col}")
             
             # Rotate x labels if there are many points
             if len(df[x_col].unique()) > 5:
-                plt.xticks(rotation=45, ha='right')
+                ax.tick_params(axis='x', labelrotation=45)
+                for label in ax.get_xticklabels():
+                    label.set_horizontalalignment('right')
         
         elif chart_type == "pie":
             # For pie charts, we need to aggregate data if there are too many categories
@@ -171,27 +185,26 @@ def create_visualization(data: pd.DataFrame, request: str) -> Optional[str]:
             else:
                 pie_data = df.groupby(x_col)[y_col].sum()
             
-            plt.pie(pie_data, labels=pie_data.index, autopct='%1.1f%%')
-            plt.axis('equal')
-            plt.title(f"Distribution of {y_col} by {x_col}")
+            ax.pie(pie_data, labels=pie_data.index, autopct='%1.1f%%')
+            ax.axis('equal')
+            ax.set_title(f"Distribution of {y_col} by {x_col}")
         
         elif chart_type == "scatter":
-            sns.scatterplot(x=x_col, y=y_col, data=df)
-            plt.title(f"Scatter Plot: {y_col} vs {x_col}")
+            sns.scatterplot(x=x_col, y=y_col, data=df, ax=ax)
+            ax.set_title(f"Scatter Plot: {y_col} vs {x_col}")
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save to BytesIO object
         buffer = BytesIO()
-        plt.savefig(buffer, format='png')
+        fig.savefig(buffer, format='png')
         buffer.seek(0)
         
         # Convert to base64 for embedding
         img_str = base64.b64encode(buffer.read()).decode('utf-8')
-        plt.close()
         
         return img_str
         
     except Exception as e:
-        print(f"❌ Error creating visualization: {e}")
+        print(f"❌ Error creating visualization: {e}", file=sys.stderr)
         return None
\ No newline at end of file